@@ -1,253 +1,1240 @@
 """
 Claude API integration for OCR processing using AWS Bedrock.
 """
-import base64
-import json
+import asyncio
+import contextlib
+import hashlib
+import heapq
+import io
+import itertools
+import os
+import random
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import AsyncIterator, Dict, List, Optional, Any, Tuple, Union
 import boto3
+from botocore.config import Config
 from botocore.exceptions import ClientError
+from PIL import Image
+from pydantic import TypeAdapter, ValidationError
 
-from .config import CLAUDE_MODEL, MAX_RETRIES, RETRY_DELAY, AWS_REGION
+try:
+    import aioboto3
+except ImportError:
+    aioboto3 = None
+
+from .config import (
+    CLAUDE_MODEL, MAX_RETRIES, RETRY_DELAY, MAX_RETRY_DELAY, AWS_REGION, MAX_INFLIGHT, BEDROCK_MAX_TPS,
+    BEDROCK_CONNECT_TIMEOUT, BEDROCK_READ_TIMEOUT, PROMPT_CACHING, LATENCY_OPTIMIZED,
+    PAGES_PER_REQUEST, MAX_REQUEST_IMAGES, MAX_BATCH_TOKENS, LATENCY_BUDGET_MS, PAGE_LATENCY_MS,
+    OCR_CACHE_DIR, OCR_CACHE
+)
 from .models import Component, Page
-from .utils import setup_logger, format_component_id
+from .utils import (
+    setup_logger, format_component_id, loads_json, extract_json_object, IncrementalJsonParser,
+    write_file_bytes
+)
 
 
 logger = setup_logger(__name__)
 
+# Claude downscales large images, so an image never costs more than about this many tokens
+_MAX_IMAGE_TOKENS = 1600
+
+# Validates all components of a page in one pass
+_COMPONENTS_ADAPTER = TypeAdapter(List[Component])
+
+# Characters of a response kept for logging when no JSON object is found
+_RESPONSE_PREVIEW_CHARS = 500
+
+# Text still read after the JSON object completes; reading the stream to its end
+# returns the connection to the pool, but longer trailing output is cut off
+_MAX_TRAILING_CHARS = 2000
+
+# Static OCR instructions shared by every page, sent as the system prompt
+OCR_SYSTEM_PROMPT = """You are an expert OCR system analyzing pages of a procurement document.
+Extract ALL text and structured content from each page image and return it in a specific JSON format.
+
+Identify and extract:
+1. All text blocks (headers, paragraphs, lists, etc.)
+2. Tables with their structure preserved
+3. Any form fields or structured data
+4. Headers and footers
+
+For each component found, provide:
+- component_id: String in format "<page>_<index>", where <page> is the page number given with the image (e.g., "3_0", "3_1")
+- type: One of ["text", "table", "header", "footer"]
+- content: The extracted text content. For tables, use markdown table format.
+- confidence: Float between 0 and 1 indicating extraction confidence
+- bbox: Approximate bounding box [x1, y1, x2, y2] in pixels (estimate based on position)
+
+Return ONLY a valid JSON object with this structure:
+{
+    "components": [
+        {
+            "component_id": "3_0",
+            "type": "text",
+            "content": "Extracted text here",
+            "confidence": 0.95,
+            "bbox": [100, 100, 800, 200]
+        }
+    ]
+}
+
+Be thorough and extract ALL visible text. For tables, preserve the structure using markdown format.
+"""
+
+
+def _is_throttling(error: ClientError) -> bool:
+    """
+    Check whether a Bedrock error is a throttling error.
+    
+    Errors raised mid-stream use a lower-case code ('throttlingException'),
+    so the comparison ignores case.
+    
+    Args:
+        error: Error returned by Bedrock
+        
+    Returns:
+        True if the request was throttled
+    """
+    return error.response.get('Error', {}).get('Code', '').lower() == 'throttlingexception'
+
+
+def _backoff_delay(attempt: int, error: Optional[ClientError] = None) -> float:
+    """
+    Compute how long to wait before retrying a Bedrock request.
+    
+    Uses capped exponential backoff with random jitter, so concurrent workers that
+    were throttled together do not all retry at the same moment. A Retry-After
+    header on the error response takes precedence.
+    
+    Args:
+        attempt: 0-indexed attempt that just failed
+        error: Error returned by Bedrock, if any
+        
+    Returns:
+        Delay in seconds
+    """
+    if error is not None:
+        headers = error.response.get('ResponseMetadata', {}).get('HTTPHeaders', {})
+        retry_after = headers.get('retry-after')
+        if retry_after:
+            try:
+                return min(MAX_RETRY_DELAY, float(retry_after))
+            except ValueError:
+                pass
+    
+    return min(MAX_RETRY_DELAY, RETRY_DELAY * 2 ** attempt) + random.uniform(0, RETRY_DELAY)
+
+
+def _describe_pages(page_numbers: List[int]) -> str:
+    """
+    Describe the pages of a request for log messages.
+    
+    Args:
+        page_numbers: Page numbers in the request
+        
+    Returns:
+        "page N" or "pages N-M"
+    """
+    if len(page_numbers) == 1:
+        return f"page {page_numbers[0]}"
+    return f"pages {page_numbers[0]}-{page_numbers[-1]}"
+
+
+def _estimate_image_tokens(image: Union[Path, bytes]) -> int:
+    """
+    Estimate the input tokens Claude uses for an image (width * height / 750).
+    
+    Only the image header is read to get the dimensions.
+    
+    Args:
+        image: Image file path or encoded image bytes
+        
+    Returns:
+        Estimated token count
+    """
+    source = io.BytesIO(image) if isinstance(image, bytes) else image
+    try:
+        with Image.open(source) as img:
+            width, height = img.size
+    except Exception as e:
+        logger.warning(f"Could not read image size, assuming the maximum token cost: {str(e)}")
+        return _MAX_IMAGE_TOKENS
+    return min(_MAX_IMAGE_TOKENS, max(1, width * height // 750))
+
+
+def _max_pages_per_request(pages_per_request: int, latency_budget_ms: float = LATENCY_BUDGET_MS) -> int:
+    """
+    Get the number of pages allowed in one Bedrock request.
+    
+    Args:
+        pages_per_request: Requested maximum number of pages per request
+        latency_budget_ms: Target time for one request (0 = no limit)
+        
+    Returns:
+        Maximum number of pages per request, at least 1
+    """
+    max_pages = max(1, min(pages_per_request, MAX_REQUEST_IMAGES))
+    if latency_budget_ms > 0:
+        max_pages = max(1, min(max_pages, int(latency_budget_ms // PAGE_LATENCY_MS)))
+    return max_pages
+
+
+def _group_pages(images: List[Union[Path, bytes]], page_numbers: List[int],
+                 pages_per_request: int,
+                 latency_budget_ms: float = LATENCY_BUDGET_MS) -> List[Tuple[List[Union[Path, bytes]], List[int]]]:
+    """
+    Pack consecutive pages greedily into groups sent in one Bedrock request each.
+    
+    A group is closed when adding the next page would exceed pages_per_request,
+    MAX_BATCH_TOKENS of estimated image tokens, or the pages that fit in
+    latency_budget_ms. Every group holds at least one page.
+    
+    Args:
+        images: Image file paths or encoded image bytes
+        page_numbers: Page number for each image
+        pages_per_request: Maximum number of pages per request
+        latency_budget_ms: Target time for one request (0 = no limit)
+        
+    Returns:
+        List of tuples (images, page_numbers)
+    """
+    max_pages = _max_pages_per_request(pages_per_request, latency_budget_ms)
+    
+    if max_pages == 1:
+        return [([image], [page_number]) for image, page_number in zip(images, page_numbers)]
+    
+    groups = []
+    group_images, group_pages, group_tokens = [], [], 0
+    for image, page_number in zip(images, page_numbers):
+        tokens = _estimate_image_tokens(image)
+        if group_pages and (len(group_pages) == max_pages or group_tokens + tokens > MAX_BATCH_TOKENS):
+            groups.append((group_images, group_pages))
+            group_images, group_pages, group_tokens = [], [], 0
+        group_images.append(image)
+        group_pages.append(page_number)
+        group_tokens += tokens
+    
+    if group_pages:
+        groups.append((group_images, group_pages))
+    return groups
+
+
+@lru_cache(maxsize=None)
+def _get_bedrock_client(aws_region: str, max_pool_connections: int):
+    """
+    Get the process-wide Bedrock runtime client for a region.
+    
+    The connection pool is sized to the request concurrency so worker threads
+    never wait on a free connection, and connections are kept alive between
+    pages. The client is created once per process and shared by all threads.
+    
+    Args:
+        aws_region: AWS region for Bedrock service
+        max_pool_connections: HTTP connection pool size
+        
+    Returns:
+        boto3 bedrock-runtime client
+    """
+    return boto3.client(
+        service_name='bedrock-runtime',
+        region_name=aws_region,
+        config=_bedrock_client_config(max_pool_connections)
+    )
+
+
+def _bedrock_client_config(max_pool_connections: int) -> Config:
+    """
+    Build the botocore configuration for Bedrock runtime clients.
+    
+    botocore makes a single attempt because the OCR clients retry with their
+    own backoff, but adaptive mode still slows the request rate client-side
+    once Bedrock starts throttling.
+    
+    Args:
+        max_pool_connections: HTTP connection pool size
+        
+    Returns:
+        botocore Config instance
+    """
+    return Config(
+        max_pool_connections=max_pool_connections,
+        tcp_keepalive=True,
+        connect_timeout=BEDROCK_CONNECT_TIMEOUT,
+        read_timeout=BEDROCK_READ_TIMEOUT,
+        retries={'total_max_attempts': 1, 'mode': 'adaptive'}
+    )
+
+
+class _StreamedResponse:
+    """
+    Collect a streamed Converse response up to the end of its JSON object.
+    
+    The parser only buffers text from the opening brace on, so the full
+    response is never assembled; a short preview is kept for error logs.
+    Text after the object is counted but not kept.
+    """
+    
+    def __init__(self):
+        self._parser = IncrementalJsonParser()
+        self._received = 0
+        self._preview = ''
+        self._json_str = None
+        self._trailing = 0
+    
+    def add_event(self, event: Dict[str, Any]) -> bool:
+        """
+        Consume one Converse stream event.
+        
+        Args:
+            event: Event from the response stream
+            
+        Returns:
+            True when the stream should be closed without reading the rest,
+            because too much text followed the JSON object
+        """
+        delta = event.get('contentBlockDelta', {}).get('delta', {}).get('text')
+        if not delta:
+            return False
+        
+        if self._json_str is not None:
+            self._trailing += len(delta)
+            return self._trailing > _MAX_TRAILING_CHARS
+        
+        if not self._received:
+            logger.debug("Receiving OCR output from Bedrock")
+        self._received += len(delta)
+        if len(self._preview) < _RESPONSE_PREVIEW_CHARS:
+            self._preview += delta[:_RESPONSE_PREVIEW_CHARS - len(self._preview)]
+        
+        self._json_str = self._parser.feed(delta)
+        if self._json_str is not None:
+            logger.debug(f"OCR JSON complete after {self._received} characters")
+        return False
+    
+    def result(self) -> str:
+        """
+        Get the response once the stream has been read.
+        
+        Returns:
+            The JSON object text, or the start of the response text if it did
+            not contain a complete object
+        """
+        if self._json_str is not None:
+            return self._json_str
+        if not self._received:
+            raise ValueError("No content in response")
+        return self._preview
+
+
+class _ClaudeOCRBase:
+    """Prompt, request and response handling shared by the sync and async OCR clients."""
+    
+    def __init__(self, max_tps: float = BEDROCK_MAX_TPS, use_cache: bool = OCR_CACHE):
+        """
+        Initialize the shared OCR state.
+        
+        Args:
+            max_tps: Maximum Bedrock requests started per second (0 = no limit)
+            use_cache: Reuse OCR responses cached in OCR_CACHE_DIR
+        """
+        self.model_id = CLAUDE_MODEL
+        self.cache_dir = OCR_CACHE_DIR if use_cache else None
+        if self.cache_dir is not None:
+            self.cache_dir.mkdir(exist_ok=True, parents=True)
+        
+        # Pages served from the cache, reported once per document
+        self._cached_pages = 0
+        self._cache_lock = threading.Lock()
+        
+        # Request start spacing to stay under the Bedrock TPS quota
+        self._min_request_interval = 1.0 / max_tps if max_tps > 0 else 0.0
+        self._rate_lock = threading.Lock()
+        self._next_request_time = 0.0
+    
+    @staticmethod
+    def _read_image(image: Union[Path, bytes], image_format: Optional[str]) -> Tuple[bytes, str]:
+        """
+        Load an image and resolve its format.
+        
+        Args:
+            image: Image file path or encoded image bytes
+            image_format: Image format (png, jpeg, webp); defaults to the file
+                suffix and is required for image bytes
+            
+        Returns:
+            Tuple (image bytes, lower-case image format)
+        """
+        if isinstance(image, bytes):
+            if image_format is None:
+                raise ValueError("image_format is required when passing image bytes")
+            return image, image_format.lower()
+        
+        with open(image, 'rb') as f:
+            image_data = f.read()
+        return image_data, (image_format or image.suffix[1:]).lower()
+    
+    @classmethod
+    def _read_images(cls, images: List[Union[Path, bytes]],
+                     image_format: Optional[str]) -> List[Tuple[bytes, str]]:
+        """
+        Load several images and resolve their formats.
+        
+        Args:
+            images: Image file paths or encoded image bytes
+            image_format: Image format (png, jpeg, webp); defaults to the file
+                suffix and is required for image bytes
+            
+        Returns:
+            List of tuples (image bytes, lower-case image format)
+        """
+        return [cls._read_image(image, image_format) for image in images]
+    
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def _create_ocr_prompt(page_number: int) -> str:
+        """
+        Create the page-specific part of the prompt for Claude OCR.
+        
+        The instructions live in OCR_SYSTEM_PROMPT so they are identical for
+        every page and can be served from Bedrock's prompt cache.
+        
+        Args:
+            page_number: Current page number
+            
+        Returns:
+            Formatted prompt string
+        """
+        return (f"This image is page {page_number} of the document. "
+                f'Use component IDs "{page_number}_0", "{page_number}_1", and so on.')
+    
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def _create_batch_prompt(page_numbers: Tuple[int, ...]) -> str:
+        """
+        Create the page-specific part of the prompt for several pages in one request.
+        
+        Args:
+            page_numbers: Page number of each image, in order
+            
+        Returns:
+            Formatted prompt string
+        """
+        pages = ", ".join(str(page_number) for page_number in page_numbers)
+        return (f"These {len(page_numbers)} images are pages {pages} of the document, in that order. "
+                'Instead of a single components object, return ONLY a valid JSON object of the form '
+                '{"pages": [{"page_number": <page>, "components": [...]}]} with one entry per image, '
+                "where each components list follows the structure above. "
+                'Use component IDs "<page>_0", "<page>_1", and so on, with the page number of that image.')
+    
+    def _create_request(self, images: List[Tuple[bytes, str]], page_numbers: List[int]) -> Dict[str, Any]:
+        """
+        Build the Converse API request for one or more pages.
+        
+        Args:
+            images: Tuples (image bytes, image format) in page order
+            page_numbers: Page number of each image
+            
+        Returns:
+            Keyword arguments for converse_stream
+        """
+        if len(page_numbers) == 1:
+            prompt = self._create_ocr_prompt(page_numbers[0])
+        else:
+            prompt = self._create_batch_prompt(tuple(page_numbers))
+        return self._build_converse_request(images, prompt)
+    
+    def _build_converse_request(self, images: List[Tuple[bytes, str]], prompt: str) -> Dict[str, Any]:
+        """
+        Build the Converse API request for a list of page images.
+        
+        Args:
+            images: Tuples (image bytes, image format) in page order
+            prompt: OCR prompt
+            
+        Returns:
+            Keyword arguments for converse_stream
+        """
+        # The Converse API takes the raw image bytes, so nothing is base64-encoded
+        # or JSON-serialized on our side
+        content = [
+            {
+                "image": {
+                    "format": image_format,
+                    "source": {"bytes": image_data}
+                }
+            }
+            for image_data, image_format in images
+        ]
+        content.append({"text": prompt})
+        messages = [{"role": "user", "content": content}]
+        
+        request = {
+            "modelId": self.model_id,
+            "system": [{"text": OCR_SYSTEM_PROMPT}],
+            "messages": messages,
+            "inferenceConfig": {"maxTokens": 4096, "temperature": 0.5}
+        }
+        
+        if PROMPT_CACHING:
+            # Cache the static instructions so later pages only pay for the image and suffix
+            request["system"].append({"cachePoint": {"type": "default"}})
+        if LATENCY_OPTIMIZED:
+            request["performanceConfig"] = {"latency": "optimized"}
+        
+        return request
+    
+    @staticmethod
+    def _cache_key(request: Dict[str, Any]) -> str:
+        """
+        Hash everything in a request that affects its response.
+        
+        Each piece is length-prefixed so that different splits of the same
+        bytes cannot produce the same key.
+        
+        Args:
+            request: Keyword arguments for converse_stream
+            
+        Returns:
+            Hex digest used as the cache file name
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        
+        def add(piece: bytes):
+            digest.update(len(piece).to_bytes(8, 'little'))
+            digest.update(piece)
+        
+        add(request["modelId"].encode('utf-8'))
+        add(repr(sorted(request["inferenceConfig"].items())).encode('utf-8'))
+        for block in request["system"]:
+            add(block.get("text", "").encode('utf-8'))
+        for block in request["messages"][0]["content"]:
+            if "image" in block:
+                add(block["image"]["format"].encode('utf-8'))
+                add(block["image"]["source"]["bytes"])
+            else:
+                add(block["text"].encode('utf-8'))
+        return digest.hexdigest()
+    
+    def _load_cached_pages(self, request: Dict[str, Any],
+                           page_numbers: List[int]) -> Tuple[Optional[str], Dict[int, Page]]:
+        """
+        Look up a cached response for a request.
+        
+        Args:
+            request: Keyword arguments for converse_stream
+            page_numbers: Page numbers in the request
+            
+        Returns:
+            Tuple (cache key or None when caching is off, cached pages or an empty dict)
+        """
+        if self.cache_dir is None:
+            return None, {}
+        
+        cache_key = self._cache_key(request)
+        try:
+            with open(self.cache_dir / f"{cache_key}.json", 'rb') as f:
+                response = f.read().decode('utf-8')
+        except FileNotFoundError:
+            return cache_key, {}
+        
+        page_data = self._parse_response(response, page_numbers)
+        if page_data:
+            logger.debug(f"Using cached OCR result for {_describe_pages(page_numbers)}")
+            with self._cache_lock:
+                self._cached_pages += len(page_data)
+        return cache_key, page_data
+    
+    def _log_cache_hits(self, cached_before: int, total_pages: int):
+        """
+        Report how many pages of a document were served from the cache.
+        
+        Args:
+            cached_before: Value of the cached page count when the document started
+            total_pages: Number of pages in the document
+        """
+        cached = self._cached_pages - cached_before
+        if cached:
+            logger.info(f"Reused cached OCR results for {cached} of {total_pages} pages "
+                        f"from {self.cache_dir} instead of calling Bedrock")
+    
+    def _store_cached_response(self, cache_key: Optional[str], response: str):
+        """
+        Cache a response that parsed successfully.
+        
+        The file is written under a temporary name and renamed, so concurrent
+        workers never read a partial entry.
+        
+        Args:
+            cache_key: Key from _load_cached_pages, or None when caching is off
+            response: Response text from Claude
+        """
+        if cache_key is None:
+            return
+        
+        cache_path = self.cache_dir / f"{cache_key}.json"
+        temp_path = self.cache_dir / f"{cache_key}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            write_file_bytes(temp_path, response.encode('utf-8'))
+            os.replace(temp_path, cache_path)
+        except OSError as e:
+            logger.warning(f"Could not cache OCR response: {str(e)}")
+    
+    def _reserve_request_slot(self) -> float:
+        """
+        Reserve the next request start time under the TPS limit.
+        
+        Returns:
+            Seconds to wait before starting the request
+        """
+        if not self._min_request_interval:
+            return 0.0
+        
+        with self._rate_lock:
+            now = time.monotonic()
+            start_time = max(now, self._next_request_time)
+            self._next_request_time = start_time + self._min_request_interval
+        
+        return start_time - now
+    
+    def _parse_response(self, response: str, page_numbers: List[int]) -> Dict[int, Page]:
+        """
+        Parse Claude's response to a one- or multi-page request.
+        
+        Args:
+            response: Raw response from Claude
+            page_numbers: Page numbers in the request
+            
+        Returns:
+            Dictionary of page number to Page for the pages found in the response
+        """
+        if len(page_numbers) == 1:
+            page = self._parse_claude_response(response, page_numbers[0])
+            return {page_numbers[0]: page} if page else {}
+        return self._parse_batch_response(response, page_numbers)
+    
+    def _parse_batch_response(self, response: str, page_numbers: List[int]) -> Dict[int, Page]:
+        """
+        Parse Claude's response to a multi-page request into Page objects.
+        
+        Args:
+            response: Raw response from Claude
+            page_numbers: Page numbers in the request
+            
+        Returns:
+            Dictionary of page number to Page for the pages found in the response
+        """
+        pages = {}
+        try:
+            json_str = extract_json_object(response)
+            
+            if json_str is None:
+                raise ValueError("No JSON found in response")
+            
+            data = loads_json(json_str)
+            
+            wanted = set(page_numbers)
+            for entry in data.get('pages', []):
+                try:
+                    page_number = int(entry.get('page_number'))
+                except (TypeError, ValueError):
+                    logger.warning("Skipping page entry without a valid page_number")
+                    continue
+                if page_number in wanted:
+                    pages[page_number] = self._build_page(entry.get('components', []), page_number)
+            
+        except Exception as e:
+            logger.error(f"Error parsing Claude response: {str(e)}")
+            logger.debug(f"Response was: {response[:_RESPONSE_PREVIEW_CHARS]}...")
+        
+        return pages
+    
+    def _build_page(self, components_data: List[Dict[str, Any]], page_number: int) -> Page:
+        """
+        Validate a page's components and build the Page object.
+        
+        Args:
+            components_data: Component dictionaries from Claude's response
+            page_number: Page number
+            
+        Returns:
+            Page object with the valid components
+        """
+        try:
+            components = _COMPONENTS_ADAPTER.validate_python(components_data)
+        except ValidationError:
+            # Validate one by one to skip only the invalid components
+            components = []
+            for comp_data in components_data:
+                try:
+                    components.append(Component.from_claude(comp_data))
+                except Exception as e:
+                    logger.warning(f"Failed to parse component: {str(e)}")
+        
+        return Page(
+            page_number=page_number,
+            component_count=len(components),
+            components=components
+        )
+    
+    def _parse_claude_response(self, response: str, page_number: int) -> Optional[Page]:
+        """
+        Parse Claude's response into a Page object.
+        
+        Args:
+            response: Raw response from Claude
+            page_number: Page number
+            
+        Returns:
+            Page object or None if parsing fails
+        """
+        try:
+            # Extract JSON from response
+            # Claude might add explanatory text, so we need to find the JSON
+            json_str = extract_json_object(response)
+            
+            if json_str is None:
+                raise ValueError("No JSON found in response")
+            
+            data = loads_json(json_str)
+            
+            # Create Component and Page objects
+            return self._build_page(data.get('components', []), page_number)
+            
+        except Exception as e:
+            logger.error(f"Error parsing Claude response: {str(e)}")
+            logger.debug(f"Response was: {response[:_RESPONSE_PREVIEW_CHARS]}...")
+            return None
+
 
-class ClaudeOCR:
+class ClaudeOCR(_ClaudeOCRBase):
     """Handle OCR processing using Claude via AWS Bedrock."""
     
-    def __init__(self, aws_region: str = AWS_REGION):
+    def __init__(self, aws_region: str = AWS_REGION, max_inflight: int = MAX_INFLIGHT,
+                 max_tps: float = BEDROCK_MAX_TPS, use_cache: bool = OCR_CACHE):
         """
         Initialize Claude OCR client using AWS Bedrock.
         
         Args:
             aws_region: AWS region for Bedrock service
+            max_inflight: Maximum number of concurrent Bedrock requests
+            max_tps: Maximum Bedrock requests started per second (0 = no limit)
+            use_cache: Reuse OCR responses cached in OCR_CACHE_DIR
         """
-        self.bedrock_runtime = boto3.client(
-            service_name='bedrock-runtime',
-            region_name=aws_region
+        super().__init__(max_tps, use_cache)
+        
+        # boto3 clients are thread-safe once created, so the worker threads share this one
+        self.bedrock_runtime = _get_bedrock_client(aws_region, max(1, max_inflight))
+        
+        # Worker pool for concurrent page requests
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(1, max_inflight),
+            thread_name_prefix="bedrock-ocr"
         )
-        self.model_id = CLAUDE_MODEL
         
         # Log available Claude models in Bedrock
         logger.info(f"Using Claude model: {self.model_id} in region: {aws_region}")
     
-    def process_image(self, image_path: Path, page_number: int) -> Optional[Page]:
+    def process_images_batch(self, images: List[Union[Path, bytes]], page_numbers: List[int],
+                             image_format: Optional[str] = None,
+                             pages_per_request: int = PAGES_PER_REQUEST,
+                             latency_budget_ms: float = LATENCY_BUDGET_MS) -> List[Tuple[int, Optional[Page]]]:
+        """
+        Process several images concurrently using Claude for OCR.
+        
+        Args:
+            images: Image file paths or encoded image bytes
+            page_numbers: Page number for each image
+            image_format: Image format (png, jpeg, webp), required for image bytes
+            pages_per_request: Maximum number of consecutive pages sent in one Bedrock request
+            latency_budget_ms: Target time for one multi-page request (0 = no limit)
+            
+        Returns:
+            List of tuples (page_number, Page or None), sorted by page number
+        """
+        groups = _group_pages(images, page_numbers, pages_per_request, latency_budget_ms)
+        logger.info(f"Submitting {len(images)} pages to Claude OCR via Bedrock in {len(groups)} requests")
+        cached_before = self._cached_pages
+        
+        pending = {}
+        
+        def submit(group_images, group_pages, attempt):
+            future = self._executor.submit(self._process_group, group_images, group_pages, image_format)
+            pending[future] = (group_images, group_pages, attempt)
+        
+        for group_images, group_pages in groups:
+            submit(group_images, group_pages, 0)
+        
+        # Throttled groups wait here, ordered by retry time, rather than sleeping
+        # in a worker thread and holding one of the MAX_INFLIGHT slots
+        retries = []
+        retry_order = itertools.count()
+        
+        results = []
+        while pending or retries:
+            now = time.monotonic()
+            while retries and retries[0][0] <= now:
+                _, _, group_images, group_pages, attempt = heapq.heappop(retries)
+                submit(group_images, group_pages, attempt)
+            
+            timeout = retries[0][0] - now if retries else None
+            done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            for future in done:
+                group_images, group_pages, attempt = pending.pop(future)
+                pages = _describe_pages(group_pages)
+                try:
+                    group_results, missing = future.result()
+                    results.extend(group_results)
+                    
+                    # A multi-page response can miss pages, e.g. when it hits the
+                    # output token limit, so those pages are sent on their own. They
+                    # are queued here so a throttled page is retried by itself
+                    for image, page_number in missing:
+                        logger.warning(f"Page {page_number} missing from the batched response, "
+                                       f"processing it alone")
+                        submit([image], [page_number], 0)
+                except ClientError as e:
+                    if attempt + 1 < MAX_RETRIES:
+                        delay = _backoff_delay(attempt, e)
+                        logger.warning(f"Rate limited on {pages} (attempt {attempt + 1}), "
+                                       f"retrying in {delay:.1f}s...")
+                        heapq.heappush(retries, (time.monotonic() + delay, next(retry_order),
+                                                 group_images, group_pages, attempt + 1))
+                    else:
+                        logger.error(f"Failed to process {pages} after {MAX_RETRIES} attempts: {str(e)}")
+                        results.extend((page_number, None) for page_number in group_pages)
+        
+        results.sort(key=lambda result: result[0])
+        self._log_cache_hits(cached_before, len(results))
+        return results
+    
+    def _process_group(self, images: List[Union[Path, bytes]], page_numbers: List[int],
+                       image_format: Optional[str] = None) -> Tuple[List[Tuple[int, Optional[Page]]],
+                                                                    List[Tuple[Union[Path, bytes], int]]]:
+        """
+        Worker for process_images_batch. Throttling errors are raised so the
+        batch can re-submit the group with backoff.
+        
+        Args:
+            images: Image file paths or encoded image bytes
+            page_numbers: Page number for each image
+            image_format: Image format (png, jpeg, webp), required for image bytes
+            
+        Returns:
+            Tuple (list of (page_number, Page or None) for the finished pages,
+            list of (image, page_number) for pages missing from a multi-page response)
+        """
+        pages = self._process_request(images, page_numbers, image_format, retry_throttling=False)
+        
+        results, missing = [], []
+        for image, page_number in zip(images, page_numbers):
+            page = pages.get(page_number)
+            if page is None and len(page_numbers) > 1:
+                missing.append((image, page_number))
+            else:
+                results.append((page_number, page))
+        return results, missing
+    
+    def process_image(self, image: Union[Path, bytes], page_number: int,
+                      image_format: Optional[str] = None,
+                      retry_throttling: bool = True) -> Optional[Page]:
         """
         Process a single image using Claude for OCR.
         
         Args:
-            image_path: Path to the image file
+            image: Image file path, or encoded image bytes already in memory
             page_number: Page number in the document
+            image_format: Image format (png, jpeg, webp); defaults to the file
+                suffix and is required for image bytes
+            retry_throttling: Retry throttled requests here instead of raising
             
         Returns:
             Page object with extracted components
         """
-        logger.info(f"Processing page {page_number} with Claude OCR via Bedrock")
+        return self._process_request([image], [page_number], image_format, retry_throttling).get(page_number)
+    
+    def _process_request(self, images: List[Union[Path, bytes]], page_numbers: List[int],
+                         image_format: Optional[str] = None,
+                         retry_throttling: bool = True) -> Dict[int, Page]:
+        """
+        OCR one or more pages in a single Bedrock request.
         
-        # Read and encode image
-        try:
-            with open(image_path, 'rb') as f:
-                image_data = f.read()
+        Args:
+            images: Image file paths or encoded image bytes
+            page_numbers: Page number for each image
+            image_format: Image format (png, jpeg, webp); defaults to the file
+                suffix and is required for image bytes
+            retry_throttling: Retry throttled requests here instead of raising
             
-            # Encode to base64
-            base64_image = base64.b64encode(image_data).decode('utf-8')
+        Returns:
+            Dictionary of page number to Page for the pages that were processed
+        """
+        pages = _describe_pages(page_numbers)
+        logger.info(f"Processing {pages} with Claude OCR via Bedrock")
+        
+        # Read images
+        try:
+            request = self._create_request(self._read_images(images, image_format), page_numbers)
             
-            # Prepare the prompt
-            prompt = self._create_ocr_prompt(page_number)
+            # Reuse the response from an earlier identical request
+            cache_key, page_data = self._load_cached_pages(request, page_numbers)
+            if page_data:
+                return page_data
             
             # Make API call with retries
             for attempt in range(MAX_RETRIES):
                 try:
-                    response = self._call_bedrock_claude(base64_image, prompt, image_path.suffix[1:])
+                    response = self._call_bedrock_claude(request)
                     
                     # Parse response
-                    page_data = self._parse_claude_response(response, page_number)
+                    page_data = self._parse_response(response, page_numbers)
                     
                     if page_data:
-                        logger.info(f"Successfully processed page {page_number} with {len(page_data.components)} components")
+                        self._store_cached_response(cache_key, response)
+                        components = sum(len(page.components) for page in page_data.values())
+                        logger.info(f"Successfully processed {pages} with {components} components")
                         return page_data
                     
+                    if len(page_numbers) > 1:
+                        # A multi-page response that did not parse was most likely cut off at
+                        # the output token limit and would be again, so the caller sends
+                        # the pages on their own instead
+                        logger.warning(f"No pages parsed from the response for {pages}")
+                        return {}
+                    if attempt < MAX_RETRIES - 1:
+                        delay = _backoff_delay(attempt)
+                        logger.warning(f"No OCR result on attempt {attempt + 1}, retrying in {delay:.1f}s...")
+                        time.sleep(delay)
+                    
                 except ClientError as e:
-                    error_code = e.response['Error']['Code']
-                    if error_code == 'ThrottlingException':
-                        logger.warning(f"Rate limited on attempt {attempt + 1}, retrying...")
-                        time.sleep(RETRY_DELAY * (attempt + 1))  # Exponential backoff
+                    if _is_throttling(e) and not retry_throttling:
+                        raise
+                    elif _is_throttling(e):
+                        delay = _backoff_delay(attempt, e)
+                        logger.warning(f"Rate limited on attempt {attempt + 1}, retrying in {delay:.1f}s...")
+                        time.sleep(delay)
                     else:
                         logger.error(f"AWS Bedrock error: {str(e)}")
                         raise
                 except Exception as e:
                     logger.warning(f"Attempt {attempt + 1} failed: {str(e)}")
                     if attempt < MAX_RETRIES - 1:
-                        time.sleep(RETRY_DELAY)
+                        time.sleep(_backoff_delay(attempt))
                     else:
-                        logger.error(f"Failed to process page {page_number} after {MAX_RETRIES} attempts")
+                        logger.error(f"Failed to process {pages} after {MAX_RETRIES} attempts")
                         raise
             
+        except ClientError as e:
+            if not retry_throttling and _is_throttling(e):
+                raise
+            logger.error(f"Error processing image for {pages}: {str(e)}")
         except Exception as e:
-            logger.error(f"Error processing image {image_path}: {str(e)}")
-            return None
+            logger.error(f"Error processing image for {pages}: {str(e)}")
+        
+        return {}
     
-    def _create_ocr_prompt(self, page_number: int) -> str:
+    def _call_bedrock_claude(self, request: Dict[str, Any]) -> str:
         """
-        Create the prompt for Claude OCR.
+        Make the actual API call to Claude via the AWS Bedrock Converse API.
         
         Args:
-            page_number: Current page number
+            request: Keyword arguments for converse_stream
             
         Returns:
-            Formatted prompt string
+            The JSON object from Claude's response, or the start of the response
+            text if it did not contain a complete object
         """
-        return f"""You are an expert OCR system analyzing page {page_number} of a procurement document. 
-        Extract ALL text and structured content from this image and return it in a specific JSON format.
-
-        Identify and extract:
-        1. All text blocks (headers, paragraphs, lists, etc.)
-        2. Tables with their structure preserved
-        3. Any form fields or structured data
-        4. Headers and footers
-
-        For each component found, provide:
-        - component_id: String in format "{page_number}_{{index}}" (e.g., "{page_number}_0", "{page_number}_1")
-        - type: One of ["text", "table", "header", "footer"]
-        - content: The extracted text content. For tables, use markdown table format.
-        - confidence: Float between 0 and 1 indicating extraction confidence
-        - bbox: Approximate bounding box [x1, y1, x2, y2] in pixels (estimate based on position)
-
-        Return ONLY a valid JSON object with this structure:
-        {{
-            "components": [
-                {{
-                    "component_id": "{page_number}_0",
-                    "type": "text",
-                    "content": "Extracted text here",
-                    "confidence": 0.95,
-                    "bbox": [100, 100, 800, 200]
-                }}
-            ]
-        }}
+        # Make the API call
+        try:
+            delay = self._reserve_request_slot()
+            if delay > 0:
+                time.sleep(delay)
+            response = self.bedrock_runtime.converse_stream(**request)
+            stream = response['stream']
+            
+            # Parse the JSON as the text arrives. The closing events are still read,
+            # so the connection goes back to the pool instead of being dropped
+            collector = _StreamedResponse()
+            try:
+                for event in stream:
+                    if collector.add_event(event):
+                        stream.close()
+                        break
+            except Exception:
+                stream.close()
+                raise
+            
+            return collector.result()
+                
+        except ClientError as e:
+            logger.error(f"Bedrock API error: {e}")
+            raise
+
 
-        Be thorough and extract ALL visible text. For tables, preserve the structure using markdown format.
+class AsyncClaudeOCR(_ClaudeOCRBase):
+    """
+    Handle OCR processing using Claude via AWS Bedrock with asyncio.
+    
+    A single event loop thread drives all in-flight requests, so concurrency is
+    bounded by MAX_INFLIGHT and the connection pool rather than by threads.
+    Requires the optional aioboto3 package.
+    """
+    
+    def __init__(self, aws_region: str = AWS_REGION, max_inflight: int = MAX_INFLIGHT,
+                 max_tps: float = BEDROCK_MAX_TPS, use_cache: bool = OCR_CACHE):
+        """
+        Initialize the async Claude OCR client using AWS Bedrock.
+        
+        Args:
+            aws_region: AWS region for Bedrock service
+            max_inflight: Maximum number of concurrent Bedrock requests
+            max_tps: Maximum Bedrock requests started per second (0 = no limit)
+            use_cache: Reuse OCR responses cached in OCR_CACHE_DIR
         """
+        if aioboto3 is None:
+            raise ImportError("AsyncClaudeOCR requires aioboto3 (pip install aioboto3)")
+        
+        super().__init__(max_tps, use_cache)
+        self.aws_region = aws_region
+        self.max_inflight = max(1, max_inflight)
+        self.session = aioboto3.Session()
+        
+        logger.info(f"Using Claude model: {self.model_id} in region: {aws_region} (async)")
     
-    def _call_bedrock_claude(self, base64_image: str, prompt: str, image_format: str) -> str:
+    async def process_images_async(self, images: List[Union[Path, bytes]], page_numbers: List[int],
+                                   image_format: Optional[str] = None,
+                                   pages_per_request: int = PAGES_PER_REQUEST,
+                                   latency_budget_ms: float = LATENCY_BUDGET_MS) -> List[Tuple[int, Optional[Page]]]:
         """
-        Make the actual API call to Claude via AWS Bedrock.
+        Process several images concurrently using Claude for OCR.
         
         Args:
-            base64_image: Base64 encoded image
-            prompt: OCR prompt
-            image_format: Image format (png, jpeg, etc.)
+            images: Image file paths or encoded image bytes
+            page_numbers: Page number for each image
+            image_format: Image format (png, jpeg, webp), required for image bytes
+            pages_per_request: Maximum number of consecutive pages sent in one Bedrock request
+            latency_budget_ms: Target time for one multi-page request (0 = no limit)
             
         Returns:
-            Claude's response text
-        """
-        # Prepare the request body for Bedrock
-        request_body = {
-            "anthropic_version": "bedrock-2023-05-31",
-            "max_tokens": 4096,
-            "temperature": 0.5,
-            "messages": [
-                {
-                    "role": "user",
-                    "content": [
-                        {
-                            "type": "image",
-                            "source": {
-                                "type": "base64",
-                                "media_type": f"image/{image_format}",
-                                "data": base64_image
-                            }
-                        },
-                        {
-                            "type": "text",
-                            "text": prompt
-                        }
-                    ]
-                }
+            List of tuples (page_number, Page or None), sorted by page number
+        """
+        async def pages():
+            for page_number, image in zip(page_numbers, images):
+                yield page_number, image
+        
+        return await self.process_image_stream(pages(), image_format, pages_per_request, latency_budget_ms)
+    
+    async def process_image_stream(self, pages: AsyncIterator[Tuple[int, Union[Path, bytes]]],
+                                   image_format: Optional[str] = None,
+                                   pages_per_request: int = PAGES_PER_REQUEST,
+                                   latency_budget_ms: float = LATENCY_BUDGET_MS) -> List[Tuple[int, Optional[Page]]]:
+        """
+        Process pages concurrently as they arrive, without waiting for the rest.
+        
+        Each page is submitted once it arrives, or once enough pages have arrived
+        to fill a multi-page request, so OCR overlaps with producing later pages.
+        At most twice max_inflight requests are pending at a time; beyond that no
+        more pages are taken, so a faster producer is held back.
+        
+        Args:
+            pages: Async iterator of (page_number, image file path or encoded image bytes)
+            image_format: Image format (png, jpeg, webp), required for image bytes
+            pages_per_request: Maximum number of consecutive pages sent in one Bedrock request
+            latency_budget_ms: Target time for one multi-page request (0 = no limit)
+            
+        Returns:
+            List of tuples (page_number, Page or None), sorted by page number
+        """
+        max_pages = _max_pages_per_request(pages_per_request, latency_budget_ms)
+        semaphore = asyncio.Semaphore(self.max_inflight)
+        backlog = asyncio.Semaphore(2 * self.max_inflight)
+        tasks = []
+        cached_before = self._cached_pages
+        
+        async def process_group(group_images, group_pages):
+            pages = await self._process_request_async(client, group_images, group_pages, image_format, semaphore)
+            
+            async def fallback(image, page_number):
+                logger.warning(f"Page {page_number} missing from the batched response, processing it alone")
+                return await self.process_image_async(client, image, page_number, image_format, semaphore)
+            
+            # Pages missing from a multi-page response are sent on their own, concurrently
+            missing = [
+                (image, page_number) for image, page_number in zip(group_images, group_pages)
+                if page_number not in pages and len(group_pages) > 1
             ]
-        }
+            retried = await asyncio.gather(*(fallback(image, page_number) for image, page_number in missing))
+            pages.update((page_number, page) for (_, page_number), page in zip(missing, retried))
+            
+            return [(page_number, pages.get(page_number)) for page_number in group_pages]
         
-        # Convert to JSON string
-        body = json.dumps(request_body)
+        async def submit(buffered_images, buffered_pages):
+            # Packing reads the image sizes, so it runs in a thread off the event loop
+            groups = await asyncio.to_thread(_group_pages, buffered_images, buffered_pages, max_pages, 0)
+            for group_images, group_pages in groups:
+                # Stop taking pages while the backlog is full, so a faster producer
+                # waits for Bedrock instead of piling up images in pending tasks
+                await backlog.acquire()
+                task = asyncio.create_task(process_group(group_images, group_pages))
+                task.add_done_callback(lambda _: backlog.release())
+                tasks.append(task)
         
-        # Make the API call
-        try:
-            response = self.bedrock_runtime.invoke_model(
-                modelId=self.model_id,
-                contentType="application/json",
-                accept="application/json",
-                body=body
-            )
-            
-            # Parse the response
-            response_body = json.loads(response['body'].read())
-            
-            # Extract the text from Claude's response
-            if 'content' in response_body and len(response_body['content']) > 0:
-                return response_body['content'][0]['text']
-            else:
-                raise ValueError("No content in response")
-                
-        except ClientError as e:
-            logger.error(f"Bedrock API error: {e}")
-            raise
+        async with self.session.client(
+            'bedrock-runtime',
+            region_name=self.aws_region,
+            config=_bedrock_client_config(self.max_inflight)
+        ) as client:
+            buffered_images, buffered_pages = [], []
+            total_pages = 0
+            async for page_number, image in pages:
+                buffered_images.append(image)
+                buffered_pages.append(page_number)
+                total_pages += 1
+                if len(buffered_pages) == max_pages:
+                    await submit(buffered_images, buffered_pages)
+                    buffered_images, buffered_pages = [], []
+            
+            if buffered_pages:
+                await submit(buffered_images, buffered_pages)
+            
+            logger.info(f"Submitted {total_pages} pages to Claude OCR via Bedrock in {len(tasks)} requests")
+            grouped_results = await asyncio.gather(*tasks)
+        
+        self._log_cache_hits(cached_before, total_pages)
+        return sorted((result for results in grouped_results for result in results),
+                      key=lambda result: result[0])
     
-    def _parse_claude_response(self, response: str, page_number: int) -> Optional[Page]:
+    async def process_image_async(self, client, image: Union[Path, bytes], page_number: int,
+                                  image_format: Optional[str] = None,
+                                  semaphore: Optional[asyncio.Semaphore] = None) -> Optional[Page]:
         """
-        Parse Claude's response into a Page object.
+        Process a single image using Claude for OCR.
         
         Args:
-            response: Raw response from Claude
-            page_number: Page number
+            client: Open aioboto3 bedrock-runtime client
+            image: Image file path, or encoded image bytes already in memory
+            page_number: Page number in the document
+            image_format: Image format (png, jpeg, webp); defaults to the file
+                suffix and is required for image bytes
+            semaphore: Limits concurrent Bedrock calls; held only during the call
             
         Returns:
-            Page object or None if parsing fails
+            Page object with extracted components
         """
-        try:
-            # Extract JSON from response
-            # Claude might add explanatory text, so we need to find the JSON
-            json_start = response.find('{')
-            json_end = response.rfind('}') + 1
+        pages = await self._process_request_async(client, [image], [page_number], image_format, semaphore)
+        return pages.get(page_number)
+    
+    async def _process_request_async(self, client, images: List[Union[Path, bytes]], page_numbers: List[int],
+                                     image_format: Optional[str] = None,
+                                     semaphore: Optional[asyncio.Semaphore] = None) -> Dict[int, Page]:
+        """
+        OCR one or more pages in a single Bedrock request.
+        
+        Args:
+            client: Open aioboto3 bedrock-runtime client
+            images: Image file paths or encoded image bytes
+            page_numbers: Page number for each image
+            image_format: Image format (png, jpeg, webp); defaults to the file
+                suffix and is required for image bytes
+            semaphore: Limits concurrent Bedrock calls; held only during the call,
+                so retry backoff does not occupy a slot
             
-            if json_start == -1 or json_end == 0:
-                raise ValueError("No JSON found in response")
+        Returns:
+            Dictionary of page number to Page for the pages that were processed
+        """
+        pages = _describe_pages(page_numbers)
+        logger.info(f"Processing {pages} with Claude OCR via Bedrock")
+        
+        try:
+            # File reads and cache lookups run in threads so they do not stall
+            # the other requests on the event loop
+            image_data = await asyncio.to_thread(self._read_images, images, image_format)
+            request = self._create_request(image_data, page_numbers)
             
-            json_str = response[json_start:json_end]
-            data = json.loads(json_str)
+            # Reuse the response from an earlier identical request
+            cache_key, page_data = await asyncio.to_thread(self._load_cached_pages, request, page_numbers)
+            if page_data:
+                return page_data
             
-            # Create Component objects
-            components = []
-            for comp_data in data.get('components', []):
+            # Make API call with retries
+            for attempt in range(MAX_RETRIES):
                 try:
-                    component = Component(
-                        component_id=comp_data['component_id'],
-                        type=comp_data['type'],
-                        content=comp_data['content'],
-                        confidence=comp_data.get('confidence', 0.9),
-                        bbox=comp_data.get('bbox', [0, 0, 0, 0])
-                    )
-                    components.append(component)
+                    response = await self._call_bedrock_claude_async(client, request, semaphore)
+                    page_data = self._parse_response(response, page_numbers)
+                    
+                    if page_data:
+                        await asyncio.to_thread(self._store_cached_response, cache_key, response)
+                        components = sum(len(page.components) for page in page_data.values())
+                        logger.info(f"Successfully processed {pages} with {components} components")
+                        return page_data
+                    
+                    if len(page_numbers) > 1:
+                        # Most likely cut off at the output token limit; the caller
+                        # sends the pages on their own instead
+                        logger.warning(f"No pages parsed from the response for {pages}")
+                        return {}
+                    if attempt < MAX_RETRIES - 1:
+                        delay = _backoff_delay(attempt)
+                        logger.warning(f"No OCR result for {pages} on attempt {attempt + 1}, "
+                                       f"retrying in {delay:.1f}s...")
+                        await asyncio.sleep(delay)
+                    
+                except ClientError as e:
+                    if not _is_throttling(e) or attempt == MAX_RETRIES - 1:
+                        raise
+                    delay = _backoff_delay(attempt, e)
+                    logger.warning(f"Rate limited on {pages} (attempt {attempt + 1}), "
+                                   f"retrying in {delay:.1f}s...")
+                    await asyncio.sleep(delay)
                 except Exception as e:
-                    logger.warning(f"Failed to parse component: {str(e)}")
+                    logger.warning(f"Attempt {attempt + 1} failed: {str(e)}")
+                    if attempt == MAX_RETRIES - 1:
+                        raise
+                    await asyncio.sleep(_backoff_delay(attempt))
             
-            # Create Page object
-            page = Page(
-                page_number=page_number,
-                component_count=len(components),
-                components=components
-            )
+        except Exception as e:
+            logger.error(f"Error processing image for {pages}: {str(e)}")
+        
+        return {}
+    
+    async def _call_bedrock_claude_async(self, client, request: Dict[str, Any],
+                                         semaphore: Optional[asyncio.Semaphore] = None) -> str:
+        """
+        Make the Converse API call to Claude and read the streamed response.
+        
+        Args:
+            client: Open aioboto3 bedrock-runtime client
+            request: Keyword arguments for converse_stream
+            semaphore: Limits concurrent Bedrock calls, or None for no limit
             
-            return page
+        Returns:
+            The JSON object from Claude's response, or the start of the response
+            text if it did not contain a complete object
+        """
+        delay = self._reserve_request_slot()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        
+        async with semaphore or contextlib.nullcontext():
+            response = await client.converse_stream(**request)
+            stream = response['stream']
             
-        except Exception as e:
-            logger.error(f"Error parsing Claude response: {str(e)}")
-            logger.debug(f"Response was: {response[:500]}...")  # Log first 500 chars
-            return None
+            collector = _StreamedResponse()
+            try:
+                async for event in stream:
+                    if collector.add_event(event):
+                        stream.close()
+                        break
+            except Exception:
+                stream.close()
+                raise
+            
+            return collector.result()
 
 
 def create_ocr_client(aws_region: str = AWS_REGION) -> ClaudeOCR:
@@ -15,7 +15,13 @@ else:
     BASE_DIR = CONFIG_FILE.parent.parent
 PROCUREMENT_DOCS_DIR = BASE_DIR / "procurement_docs"
 OUTPUT_DIR = BASE_DIR / "processed_json"
-TEMP_IMAGES_DIR = BASE_DIR / "temp_images"
+# Page images are written here; point PDF_TEMP_DIR at a tmpfs (e.g. /dev/shm) for speed
+TEMP_IMAGES_DIR = Path(os.environ.get("PDF_TEMP_DIR", BASE_DIR / "temp_images"))
+
+# OCR responses are cached here, keyed by a hash of the page images, prompt and model.
+# Off by default: responses are sampled, so a cache hit replays one earlier sample
+OCR_CACHE_DIR = Path(os.environ.get("PDF_OCR_CACHE_DIR", BASE_DIR / "ocr_cache"))
+OCR_CACHE = False  # Reuse cached OCR responses instead of calling Bedrock again
 
 # Ensure directories exist with parent directories
 OUTPUT_DIR.mkdir(exist_ok=True, parents=True)
@@ -26,12 +32,31 @@ CLAUDE_MODEL = "anthropic.claude-3-opus-20240229"  # Claude Opus 3 in Bedrock
 # Alternative: "anthropic.claude-3-sonnet-20240229" for Sonnet
 # Alternative: "anthropic.claude-3-5-sonnet-20241022" for Sonnet 3.5
 AWS_REGION = "us-east-1"  # Change to your preferred region
+# Only some models and regions support these; Bedrock rejects the request otherwise
+PROMPT_CACHING = False  # Cache the static OCR instructions across pages
+LATENCY_OPTIMIZED = False  # Request latency-optimized inference
 
 # PDF processing settings
 DPI = 300  # Resolution for PDF to image conversion
-IMAGE_FORMAT = "PNG"
+IMAGE_FORMAT = "JPEG"  # JPEG pages are several times smaller than PNG for Bedrock uploads
+JPEG_QUALITY = 90
+RENDER_WORKERS = 1  # Processes used to rasterize pages; 1 renders in-process
+RENDER_PAGES_PER_WORKER = 8  # Minimum pages per render process, smaller PDFs render in-process
 MAX_RETRIES = 3
-RETRY_DELAY = 2  # seconds
+RETRY_DELAY = 2  # seconds, doubled on each retry
+MAX_RETRY_DELAY = 60  # seconds, upper bound for the exponential backoff
+
+# Bedrock concurrency settings
+PDF_WORKERS = os.cpu_count() or 1  # Processes used to handle PDFs in parallel
+MAX_INFLIGHT = min((os.cpu_count() or 1) * 2, 16)  # Maximum concurrent Bedrock OCR requests, across PDF workers
+PAGES_PER_REQUEST = 1  # Pages sent in one Bedrock request; the pages share its output token limit
+MAX_REQUEST_IMAGES = 20  # Bedrock limit on images in one Claude request
+MAX_BATCH_TOKENS = 8000  # Estimated image input tokens allowed in one multi-page request
+LATENCY_BUDGET_MS = 0  # Target time for one multi-page request (0 = no limit)
+PAGE_LATENCY_MS = 10000  # Rough Bedrock OCR time per page, used with LATENCY_BUDGET_MS
+BEDROCK_MAX_TPS = 0  # Maximum Bedrock requests started per second, across PDF workers (0 = no limit)
+BEDROCK_CONNECT_TIMEOUT = 5  # seconds
+BEDROCK_READ_TIMEOUT = 120  # seconds, a full page of OCR output can take a while
 
 # Logging settings
 LOG_DIR = BASE_DIR / "logs"
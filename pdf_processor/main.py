@@ -13,8 +13,11 @@ from botocore.exceptions import NoCredentialsError, ProfileNotFound
 sys.path.append(str(Path(__file__).parent.parent))
 
 from pdf_processor.pipeline import create_processor
-from pdf_processor.config import PROCUREMENT_DOCS_DIR, OUTPUT_DIR, AWS_REGION
-from pdf_processor.utils import setup_logger
+from pdf_processor.config import (
+    PROCUREMENT_DOCS_DIR, OUTPUT_DIR, AWS_REGION, IMAGE_FORMAT, MAX_INFLIGHT, PDF_WORKERS,
+    PAGES_PER_REQUEST, RENDER_WORKERS, RENDER_PAGES_PER_WORKER
+)
+from pdf_processor.utils import setup_logger, find_pdf_files, clear_ocr_cache
 
 
 # Load environment variables
@@ -98,7 +101,7 @@ def main():
         "--pattern",
         type=str,
         default="*.pdf",
-        help="File pattern to match (default: *.pdf)"
+        help="File pattern to match, ignoring case (default: *.pdf)"
     )
     parser.add_argument(
         "--limit",
@@ -115,6 +118,63 @@ def main():
         ],
         help="Claude model to use in Bedrock"
     )
+    parser.add_argument(
+        "--format",
+        type=str.upper,
+        default=IMAGE_FORMAT,
+        choices=["PNG", "JPEG", "WEBP"],
+        help=f"Page image format sent to Bedrock (default: {IMAGE_FORMAT})"
+    )
+    parser.add_argument(
+        "--debug",
+        action="store_true",
+        help="Write page images to the temp images folder and keep them for inspection"
+    )
+    parser.add_argument(
+        "--async-ocr",
+        dest="use_async",
+        action="store_true",
+        help="Send Bedrock requests from an asyncio event loop (requires aioboto3)"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=MAX_INFLIGHT,
+        help=f"Maximum concurrent Bedrock OCR requests, shared by the PDF workers (default: {MAX_INFLIGHT})"
+    )
+    parser.add_argument(
+        "--pdf-workers",
+        type=int,
+        default=PDF_WORKERS,
+        help=f"Number of PDFs processed in parallel (default: {PDF_WORKERS})"
+    )
+    parser.add_argument(
+        "--render-workers",
+        type=int,
+        default=RENDER_WORKERS,
+        help=f"Processes used to render the pages of PDFs with at least {RENDER_PAGES_PER_WORKER} "
+             f"pages per process (default: {RENDER_WORKERS})"
+    )
+    parser.add_argument(
+        "--pages-per-request",
+        type=int,
+        default=PAGES_PER_REQUEST,
+        help=f"Maximum number of pages sent to Claude in one Bedrock request (default: {PAGES_PER_REQUEST})"
+    )
+    parser.add_argument(
+        "--cache",
+        dest="use_cache",
+        action="store_true",
+        help="Reuse cached OCR results for identical pages instead of calling Bedrock again"
+    )
+    parser.add_argument(
+        "--clear-cache",
+        type=float,
+        nargs="?",
+        const=0,
+        metavar="DAYS",
+        help="Delete cached OCR results older than DAYS (all if DAYS is omitted) before processing"
+    )
     
     args = parser.parse_args()
     
@@ -134,8 +194,23 @@ def main():
         config.CLAUDE_MODEL = args.model
         logger.info(f"Using Claude model: {args.model}")
     
+    # Purge stale cached OCR results
+    if args.clear_cache is not None:
+        removed = clear_ocr_cache(args.clear_cache or None)
+        logger.info(f"Deleted {removed} cached OCR results")
+    
     # Create processor
-    processor = create_processor(args.region)
+    processor = create_processor(
+        aws_region=args.region,
+        image_format=args.format,
+        keep_images=args.debug,
+        use_async=args.use_async,
+        ocr_workers=args.workers,
+        pdf_workers=args.pdf_workers,
+        render_workers=args.render_workers,
+        pages_per_request=args.pages_per_request,
+        use_cache=args.use_cache
+    )
     
     # Process files
     try:
@@ -154,7 +229,7 @@ def main():
         
         else:
             # Process directory
-            pdf_files = list(args.input_dir.glob(args.pattern))
+            pdf_files = find_pdf_files(args.input_dir, args.pattern)
             
             if args.limit:
                 pdf_files = pdf_files[:args.limit]
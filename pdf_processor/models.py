@@ -1,25 +1,58 @@
 """
 Data models for the PDF processing pipeline.
 """
-from typing import List, Dict, Any, Optional
+from dataclasses import dataclass
+from typing import Annotated, List, Dict, Any, Optional, Tuple
 from datetime import datetime
-from pydantic import BaseModel, Field, validator
+from pydantic import (
+    AfterValidator, BaseModel, Field, TypeAdapter, ValidationInfo, field_validator, model_validator
+)
 
+from .config import COMPONENT_TYPES
 
-class Component(BaseModel):
-    """Model for a single component on a page."""
+
+_COMPONENT_TYPES = frozenset(COMPONENT_TYPES)
+
+
+def _validate_component_type(v: str) -> str:
+    if v not in _COMPONENT_TYPES:
+        raise ValueError(f'Component type must be one of {COMPONENT_TYPES}')
+    return v
+
+
+@dataclass(slots=True, frozen=True)
+class Component:
+    """
+    A single component on a page.
+    
+    Pages can hold dozens of these, so this is a slotted dataclass rather than a
+    Pydantic model. The field annotations carry the validation rules, which are
+    applied by a TypeAdapter when building components from OCR output.
+    """
     component_id: str
-    type: str
+    type: Annotated[str, AfterValidator(_validate_component_type)]
     content: str
-    confidence: float = Field(ge=0.0, le=1.0)
-    bbox: List[int] = Field(min_items=4, max_items=4)  # [x1, y1, x2, y2]
+    confidence: Annotated[float, Field(ge=0.0, le=1.0)] = 0.9
+    bbox: Tuple[int, int, int, int] = (0, 0, 0, 0)  # (x1, y1, x2, y2)
     
-    @validator('type')
-    def validate_type(cls, v):
-        allowed_types = ['text', 'table', 'image', 'header', 'footer']
-        if v not in allowed_types:
-            raise ValueError(f'Component type must be one of {allowed_types}')
-        return v
+    @classmethod
+    def from_claude(cls, data: Dict[str, Any]) -> "Component":
+        """
+        Build a component from one entry of Claude's OCR JSON.
+        
+        Args:
+            data: Component dictionary from the OCR response
+            
+        Returns:
+            Component instance
+            
+        Raises:
+            pydantic.ValidationError: If a field is missing or invalid
+        """
+        return _COMPONENT_ADAPTER.validate_python(data)
+
+
+_COMPONENT_ADAPTER = TypeAdapter(Component)
 
 
 class Page(BaseModel):
@@ -28,11 +61,11 @@ class Page(BaseModel):
     component_count: int = Field(ge=0)
     components: List[Component]
     
-    @validator('component_count')
-    def validate_component_count(cls, v, values):
-        if 'components' in values and v != len(values['components']):
+    @model_validator(mode='after')
+    def validate_component_count(self):
+        if self.component_count != len(self.components):
             raise ValueError('component_count must match the number of components')
-        return v
+        return self
 
 
 class ComponentStatistics(BaseModel):
@@ -49,6 +82,7 @@ class ProcessedDocument(BaseModel):
     job_id: str
     filename: str
     compilation_time: datetime
+    processing_ms: int = Field(default=0, ge=0)
     total_pages: int = Field(ge=1)
     total_components: int = Field(ge=0)
     expected_components: int = Field(ge=0)
@@ -57,28 +91,17 @@ class ProcessedDocument(BaseModel):
     average_confidence: float = Field(ge=0.0, le=1.0)
     pages: List[Page]
     
-    @validator('total_pages')
-    def validate_total_pages(cls, v, values):
-        if 'pages' in values and v != len(values['pages']):
-            raise ValueError('total_pages must match the number of pages')
-        return v
+    @model_validator(mode='after')
+    def validate_total_components(self):
+        actual_total = sum(page.component_count for page in self.pages)
+        if self.total_components != actual_total:
+            raise ValueError('total_components must match the sum of components across all pages')
+        return self
     
-    @validator('total_components')
-    def validate_total_components(cls, v, values):
-        if 'pages' in values:
-            actual_total = sum(page.component_count for page in values['pages'])
-            if v != actual_total:
-                raise ValueError('total_components must match the sum of components across all pages')
-        return v
-    
-    @validator('completeness')
-    def calculate_completeness(cls, v, values):
-        if 'total_components' in values and 'expected_components' in values:
-            if values['expected_components'] > 0:
-                return values['total_components'] / values['expected_components']
+    @field_validator('completeness')
+    @classmethod
+    def calculate_completeness(cls, v, info: ValidationInfo):
+        if 'total_components' in info.data and 'expected_components' in info.data:
+            if info.data['expected_components'] > 0:
+                return info.data['total_components'] / info.data['expected_components']
         return 1.0
-    
-    class Config:
-        json_encoders = {
-            datetime: lambda v: v.isoformat()
-        }
@@ -2,14 +2,15 @@
 PDF to image converter module.
 """
 import os
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import List, Tuple
+from typing import Iterator, List, Optional, Tuple, Union
 import fitz  # PyMuPDF
 from PIL import Image
 import io
 
-from .config import DPI, IMAGE_FORMAT, TEMP_IMAGES_DIR
-from .utils import setup_logger, clean_temp_images
+from .config import DPI, IMAGE_FORMAT, JPEG_QUALITY, TEMP_IMAGES_DIR, RENDER_WORKERS, RENDER_PAGES_PER_WORKER
+from .utils import setup_logger, clean_temp_images, write_file_bytes
 
 
 logger = setup_logger(__name__)
@@ -18,84 +19,176 @@ logger = setup_logger(__name__)
 class PDFConverter:
     """Convert PDF pages to images for OCR processing."""
     
-    def __init__(self, dpi: int = DPI, image_format: str = IMAGE_FORMAT):
+    def __init__(self, dpi: int = DPI, image_format: str = IMAGE_FORMAT,
+                 workers: int = RENDER_WORKERS):
         """
         Initialize the PDF converter.
         
         Args:
             dpi: Resolution for image conversion
             image_format: Output image format (PNG, JPEG, etc.)
+            workers: Number of processes used to render pages
         """
         self.dpi = dpi
         self.image_format = image_format
         self.zoom = dpi / 72.0  # PDF standard is 72 DPI
+        self.workers = max(1, workers)
     
-    def convert_pdf_to_images(self, pdf_path: Path, job_id: str) -> List[Tuple[int, Path]]:
+    def analyze_and_convert(self, pdf_path: Path,
+                            job_id: Optional[str] = None) -> Tuple[dict, List[Tuple[int, Union[bytes, Path]]]]:
         """
-        Convert all pages of a PDF to images.
+        Read PDF metadata and convert all pages to images, opening the file once.
         
         Args:
             pdf_path: Path to the PDF file
-            job_id: Job identifier for organizing temp files
+            job_id: Job identifier. If given, images are written under the job's
+                temp directory and returned as paths; otherwise they stay in memory
             
         Returns:
-            List of tuples (page_number, image_path)
+            Tuple of (PDF metadata dictionary, list of (page_number, image bytes or path))
+        """
+        info, pages = self.iter_pages(pdf_path, job_id)
+        return info, list(pages)
+    
+    def iter_pages(self, pdf_path: Path, job_id: Optional[str] = None,
+                   chunks_per_worker: int = 1) -> Tuple[dict, Iterator[Tuple[int, Union[bytes, Path]]]]:
+        """
+        Read PDF metadata now and render the pages lazily, opening the file once.
+        
+        Pages are rendered as the iterator is consumed, so callers can start
+        working on the first pages while later ones are still being rendered.
+        
+        Args:
+            pdf_path: Path to the PDF file
+            job_id: Job identifier. If given, images are written under the job's
+                temp directory and yielded as paths; otherwise they stay in memory
+            chunks_per_worker: Page ranges per render process; more, smaller
+                ranges make the first pages available sooner
+            
+        Returns:
+            Tuple of (PDF metadata dictionary, iterator of (page_number, image bytes or path))
         """
         logger.info(f"Starting PDF to image conversion for: {pdf_path.name}")
         
         # Create temp directory for this job
-        job_temp_dir = TEMP_IMAGES_DIR / job_id
-        job_temp_dir.mkdir(exist_ok=True)
-        
-        image_paths = []
+        output_dir = None
+        if job_id is not None:
+            output_dir = TEMP_IMAGES_DIR / job_id
+            output_dir.mkdir(exist_ok=True)
         
         try:
-            # Open PDF
             pdf_document = fitz.open(str(pdf_path))
-            total_pages = len(pdf_document)
+            try:
+                info = _read_pdf_info(pdf_document)
+            except Exception:
+                pdf_document.close()
+                raise
+        except Exception as e:
+            logger.error(f"Error converting PDF to images: {str(e)}")
+            # Clean up on error
+            if job_id is not None:
+                clean_temp_images(job_id)
+            raise
+        
+        pages = self._iter_rendered_pages(
+            pdf_document, pdf_path, info['page_count'], output_dir, job_id, chunks_per_worker
+        )
+        return info, pages
+    
+    def _iter_rendered_pages(self, pdf_document: fitz.Document, pdf_path: Path, total_pages: int,
+                             output_dir: Optional[Path], job_id: Optional[str],
+                             chunks_per_worker: int) -> Iterator[Tuple[int, Union[bytes, Path]]]:
+        """
+        Render the pages of an open document, closing it when done.
+        
+        Args:
+            pdf_document: Open PyMuPDF document
+            pdf_path: Path to the PDF file, opened again by render processes
+            total_pages: Number of pages in the document
+            output_dir: Directory to save the images in, or None to keep them in memory
+            job_id: Job identifier whose temp images are removed on error
+            chunks_per_worker: Page ranges per render process
             
-            logger.info(f"Converting {total_pages} pages to images...")
+        Yields:
+            Tuples (page_number, image bytes or path), in page order
+        """
+        try:
+            # Starting processes costs more than rendering a few pages, so short
+            # PDFs are rendered in-process
+            workers = max(1, min(self.workers, total_pages // RENDER_PAGES_PER_WORKER))
+            logger.info(f"Converting {total_pages} pages to images using {workers} worker(s)...")
             
-            for page_num in range(total_pages):
-                # Get page
-                page = pdf_document[page_num]
-                
-                # Convert to image
-                mat = fitz.Matrix(self.zoom, self.zoom)
-                pix = page.get_pixmap(matrix=mat)
-                
-                # Convert to PIL Image
-                img_data = pix.tobytes("png")
-                img = Image.open(io.BytesIO(img_data))
-                
-                # Save image
-                image_filename = f"page_{page_num + 1:04d}.{self.image_format.lower()}"
-                image_path = job_temp_dir / image_filename
-                
-                if self.image_format.upper() == "PNG":
-                    img.save(image_path, "PNG", optimize=True)
-                else:
-                    # Convert to RGB if saving as JPEG
-                    if img.mode in ('RGBA', 'LA'):
-                        rgb_img = Image.new('RGB', img.size, (255, 255, 255))
-                        rgb_img.paste(img, mask=img.split()[-1] if img.mode == 'RGBA' else None)
-                        img = rgb_img
-                    img.save(image_path, self.image_format.upper(), quality=95)
-                
-                image_paths.append((page_num + 1, image_path))
-                
-                logger.debug(f"Converted page {page_num + 1}/{total_pages}")
+            if workers <= 1:
+                yield from _render_pages(
+                    pdf_document, range(total_pages), self.zoom, self.image_format, output_dir
+                )
+            else:
+                # The render processes open their own copies of the document
+                pdf_document.close()
+                yield from self._render_in_processes(
+                    pdf_path, total_pages, workers, output_dir, chunks_per_worker
+                )
             
-            pdf_document.close()
             logger.info(f"Successfully converted {total_pages} pages")
             
-            return image_paths
-            
         except Exception as e:
             logger.error(f"Error converting PDF to images: {str(e)}")
             # Clean up on error
-            clean_temp_images(job_id)
+            if job_id is not None:
+                clean_temp_images(job_id)
             raise
+        
+        finally:
+            if not pdf_document.is_closed:
+                pdf_document.close()
+    
+    def convert_pdf_to_images(self, pdf_path: Path, job_id: str) -> List[Tuple[int, Path]]:
+        """
+        Convert all pages of a PDF to images on disk.
+        
+        Args:
+            pdf_path: Path to the PDF file
+            job_id: Job identifier for organizing temp files
+            
+        Returns:
+            List of tuples (page_number, image_path)
+        """
+        return self.analyze_and_convert(pdf_path, job_id)[1]
+    
+    def _render_in_processes(self, pdf_path: Path, total_pages: int, workers: int,
+                             output_dir: Optional[Path] = None,
+                             chunks_per_worker: int = 1) -> Iterator[Tuple[int, Union[bytes, Path]]]:
+        """
+        Render all pages using a pool of worker processes.
+        
+        Args:
+            pdf_path: Path to the PDF file
+            total_pages: Number of pages in the document
+            workers: Number of worker processes
+            output_dir: Directory to save the images in, or None to keep them in memory
+            chunks_per_worker: Page ranges per worker process
+            
+        Yields:
+            Tuples (page_number, image bytes or path), in page order
+        """
+        # Split pages into contiguous ranges, by default one per worker so each
+        # process opens the document once
+        chunk_size = -(-total_pages // (workers * max(1, chunks_per_worker)))
+        page_ranges = [
+            range(start, min(start + chunk_size, total_pages))
+            for start in range(0, total_pages, chunk_size)
+        ]
+        
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for chunk_pages in executor.map(
+                _render_page_range,
+                [str(pdf_path)] * len(page_ranges),
+                page_ranges,
+                [self.zoom] * len(page_ranges),
+                [self.image_format] * len(page_ranges),
+                [output_dir] * len(page_ranges)
+            ):
+                yield from chunk_pages
     
     def get_pdf_info(self, pdf_path: Path) -> dict:
         """
@@ -108,20 +201,112 @@ class PDFConverter:
             Dictionary with PDF metadata
         """
         try:
-            pdf_document = fitz.open(str(pdf_path))
-            info = {
-                'page_count': len(pdf_document),
-                'metadata': pdf_document.metadata,
-                'is_encrypted': pdf_document.is_encrypted,
-                'needs_pass': pdf_document.needs_pass
-            }
-            pdf_document.close()
-            return info
+            with fitz.open(str(pdf_path)) as pdf_document:
+                return _read_pdf_info(pdf_document)
         except Exception as e:
             logger.error(f"Error reading PDF info: {str(e)}")
             raise
 
 
+def _read_pdf_info(pdf_document: fitz.Document) -> dict:
+    """
+    Collect basic information about an open PDF document.
+    
+    Args:
+        pdf_document: Open PyMuPDF document
+        
+    Returns:
+        Dictionary with PDF metadata
+    """
+    return {
+        'page_count': len(pdf_document),
+        'metadata': pdf_document.metadata,
+        'is_encrypted': pdf_document.is_encrypted,
+        'needs_pass': pdf_document.needs_pass
+    }
+
+
+def _render_page_range(pdf_path: str, page_indices: range, zoom: float, image_format: str,
+                       output_dir: Optional[Path] = None) -> List[Tuple[int, Union[bytes, Path]]]:
+    """
+    Render a range of PDF pages.
+    
+    Runs in worker processes, so it opens its own handle to the document.
+    
+    Args:
+        pdf_path: Path to the PDF file
+        page_indices: 0-indexed pages to render
+        zoom: Scale factor relative to 72 DPI
+        image_format: Output image format (PNG, JPEG, etc.)
+        output_dir: Directory to save the images in, or None to return the bytes
+        
+    Returns:
+        List of tuples (page_number, image bytes or path)
+    """
+    with fitz.open(pdf_path) as pdf_document:
+        return list(_render_pages(pdf_document, page_indices, zoom, image_format, output_dir))
+
+
+def _render_pages(pdf_document: fitz.Document, page_indices: range, zoom: float, image_format: str,
+                  output_dir: Optional[Path] = None) -> Iterator[Tuple[int, Union[bytes, Path]]]:
+    """
+    Render pages of an open PDF document.
+    
+    Args:
+        pdf_document: Open PyMuPDF document
+        page_indices: 0-indexed pages to render
+        zoom: Scale factor relative to 72 DPI
+        image_format: Output image format (PNG, JPEG, etc.)
+        output_dir: Directory to save the images in, or None to yield the bytes
+        
+    Yields:
+        Tuples (page_number, image bytes or path)
+    """
+    mat = fitz.Matrix(zoom, zoom)
+    
+    for page_num in page_indices:
+        # Convert to image, rendered onto an opaque white background
+        pix = pdf_document[page_num].get_pixmap(matrix=mat, alpha=False)
+        image_data = _encode_pixmap(pix, image_format)
+        
+        logger.debug(f"Converted page {page_num + 1}")
+        
+        if output_dir is None:
+            yield page_num + 1, image_data
+            continue
+        
+        # Save image
+        image_filename = f"page_{page_num + 1:04d}.{image_format.lower()}"
+        image_path = output_dir / image_filename
+        write_file_bytes(image_path, image_data)
+        
+        yield page_num + 1, image_path
+
+
+def _encode_pixmap(pix: fitz.Pixmap, image_format: str) -> bytes:
+    """
+    Encode a rendered page in the given image format.
+    
+    Args:
+        pix: Opaque RGB pixmap
+        image_format: Output image format (PNG, JPEG, etc.)
+        
+    Returns:
+        Encoded image bytes
+    """
+    # MuPDF encodes PNG and JPEG natively, no need to round-trip through PIL
+    if image_format.upper() == "PNG":
+        return pix.tobytes("png")
+    if image_format.upper() == "JPEG":
+        return pix.tobytes("jpeg", jpg_quality=JPEG_QUALITY)
+    
+    # Other formats go through PIL, built straight from the opaque RGB samples
+    img = Image.frombytes("RGB", (pix.width, pix.height), pix.samples)
+    buffer = io.BytesIO()
+    img.save(buffer, image_format.upper(), quality=JPEG_QUALITY)
+    return buffer.getvalue()
+
+
 def convert_single_page(pdf_path: Path, page_num: int, output_path: Path, 
                        dpi: int = DPI) -> Path:
     """
@@ -146,10 +331,7 @@ def convert_single_page(pdf_path: Path, page_num: int, output_path: Path,
         zoom = dpi / 72.0
         mat = fitz.Matrix(zoom, zoom)
         pix = page.get_pixmap(matrix=mat)
-        
-        img_data = pix.tobytes("png")
-        img = Image.open(io.BytesIO(img_data))
-        img.save(output_path, "PNG", optimize=True)
+        pix.save(str(output_path), output="png")
         
         pdf_document.close()
         return output_path
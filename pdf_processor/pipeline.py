@@ -1,37 +1,107 @@
 """
 Main processing pipeline that orchestrates the entire workflow.
 """
+import asyncio
 import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
-from datetime import datetime
-from typing import List, Optional
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
 import json
 
-from .config import PROCUREMENT_DOCS_DIR, OUTPUT_DIR, AWS_REGION
-from .models import ProcessedDocument, ComponentStatistics
+import numpy as np
+
+from .config import (
+    PROCUREMENT_DOCS_DIR, OUTPUT_DIR, AWS_REGION, IMAGE_FORMAT, MAX_INFLIGHT, PDF_WORKERS,
+    RENDER_WORKERS, PAGES_PER_REQUEST, LATENCY_BUDGET_MS, OCR_CACHE, BEDROCK_MAX_TPS
+)
+from .models import ProcessedDocument, ComponentStatistics, Page
 from .utils import (
-    setup_logger, generate_job_id, clean_temp_images, 
-    save_json_output, estimate_expected_components, validate_pdf_path
+    setup_logger, generate_job_id,
+    save_json_output, estimate_expected_components, validate_pdf_path, find_pdf_files
 )
 from .pdf_converter import PDFConverter
-from .claude_ocr import ClaudeOCR
+from .claude_ocr import ClaudeOCR, AsyncClaudeOCR, _get_bedrock_client
 
 
 logger = setup_logger(__name__)
 
+# Component types counted in ComponentStatistics, taken from the model so they cannot drift
+_COMPONENT_STAT_TYPES = tuple(ComponentStatistics.model_fields)
+
+# Resolved once so the per-component check is a single set lookup
+_STAT_FIELDS = frozenset(_COMPONENT_STAT_TYPES)
+
+# One row per document in get_processing_summary; 'types' holds the
+# counts in _COMPONENT_STAT_TYPES order
+_SUMMARY_DTYPE = np.dtype([
+    ('pages', 'i8'), ('components', 'i8'), ('confidence', 'f8'), ('completeness', 'f8'),
+    ('types', 'i8', (len(_COMPONENT_STAT_TYPES),))
+])
+
+# Page ranges per render process when pages are streamed to async OCR;
+# smaller ranges get the first pages to Bedrock sooner
+_STREAM_CHUNKS_PER_WORKER = 4
+
+# Processor owned by each PDF worker process, created by _init_worker
+_worker_processor: Optional["PDFProcessor"] = None
+
 
 class PDFProcessor:
     """Main pipeline for processing PDFs with OCR."""
     
-    def __init__(self, aws_region: str = AWS_REGION):
+    def __init__(self, aws_region: str = AWS_REGION, image_format: str = IMAGE_FORMAT,
+                 keep_images: bool = False, use_async: bool = False,
+                 ocr_workers: int = MAX_INFLIGHT, pdf_workers: int = PDF_WORKERS,
+                 render_workers: int = RENDER_WORKERS,
+                 pages_per_request: int = PAGES_PER_REQUEST,
+                 latency_budget_ms: float = LATENCY_BUDGET_MS,
+                 use_cache: bool = OCR_CACHE,
+                 max_tps: float = BEDROCK_MAX_TPS):
         """
         Initialize the PDF processor.
         
         Args:
             aws_region: AWS region for Bedrock service
+            image_format: Page image format sent to Bedrock (PNG, JPEG, WEBP)
+            keep_images: Write page images to the temp directory and keep them
+                for debugging, instead of passing them to OCR in memory
+            use_async: Send the page requests from an asyncio event loop
+                (requires aioboto3) instead of a worker thread pool
+            ocr_workers: Maximum number of pages sent to Bedrock concurrently,
+                shared by all PDF workers
+            pdf_workers: Number of processes used to handle PDFs in parallel
+            render_workers: Number of processes used to render the pages of a PDF
+            pages_per_request: Maximum number of consecutive pages sent in one Bedrock request
+            latency_budget_ms: Target time for one multi-page request; smaller
+                budgets send fewer pages per request (0 = no limit)
+            use_cache: Reuse cached OCR responses for identical page images
+            max_tps: Maximum Bedrock requests started per second, shared by all
+                PDF workers (0 = no limit)
         """
-        self.pdf_converter = PDFConverter()
-        self.ocr_client = ClaudeOCR(aws_region)
+        # The boto3 client cannot be pickled, so worker processes build their
+        # own processor from these settings
+        self._worker_settings = {
+            "aws_region": aws_region,
+            "image_format": image_format,
+            "keep_images": keep_images,
+            "use_async": use_async,
+            "ocr_workers": ocr_workers,
+            "pages_per_request": pages_per_request,
+            "latency_budget_ms": latency_budget_ms,
+            "use_cache": use_cache,
+            "max_tps": max_tps,
+        }
+        self.pdf_workers = max(1, pdf_workers)
+        self.keep_images = keep_images
+        self.use_async = use_async
+        self.pages_per_request = pages_per_request
+        self.latency_budget_ms = latency_budget_ms
+        self.pdf_converter = PDFConverter(image_format=image_format, workers=render_workers)
+        ocr_class = AsyncClaudeOCR if use_async else ClaudeOCR
+        self.ocr_client = ocr_class(aws_region, max_inflight=ocr_workers, max_tps=max_tps, use_cache=use_cache)
     
     def process_single_pdf(self, pdf_path: Path) -> Optional[ProcessedDocument]:
         """
@@ -47,48 +117,68 @@ class PDFProcessor:
             logger.error(f"Invalid PDF path: {pdf_path}")
             return None
         
+        # One wall-clock reading for the document, plus a monotonic start for its timing
+        start_ns = time.monotonic_ns()
+        compilation_time = datetime.now(timezone.utc)
+        
         job_id = generate_job_id(pdf_path.name)
         logger.info(f"Starting processing job {job_id} for: {pdf_path.name}")
         
         try:
-            # Get PDF info
-            pdf_info = self.pdf_converter.get_pdf_info(pdf_path)
-            total_pages = pdf_info['page_count']
-            
-            # Convert PDF to images
-            image_paths = self.pdf_converter.convert_pdf_to_images(pdf_path, job_id)
-            
             # Process each page with OCR
             pages = []
             total_components = 0
-            confidence_sum = 0
-            confidence_count = 0
-            component_stats = ComponentStatistics()
+            page_confidences = []
+            page_types = []
             
-            for page_num, image_path in image_paths:
-                logger.info(f"Processing page {page_num}/{total_pages}")
-                
-                page = self.ocr_client.process_image(image_path, page_num)
+            # Pages are sent to Bedrock concurrently; the results come back sorted
+            # by page number and the statistics are accumulated here, so the
+            # workers share no mutable state
+            if self.use_async:
+                pdf_info, results = asyncio.run(
+                    self._convert_and_ocr_async(pdf_path, job_id if self.keep_images else None)
+                )
+            else:
+                # Get PDF info and convert PDF to images in a single pass over the file
+                pdf_info, page_images = self.pdf_converter.analyze_and_convert(
+                    pdf_path, job_id if self.keep_images else None
+                )
                 
+                logger.info(f"Running OCR on {len(page_images)} pages")
+                images = [image for _, image in page_images]
+                page_numbers = [page_num for page_num, _ in page_images]
+                results = self.ocr_client.process_images_batch(
+                    images, page_numbers, self.pdf_converter.image_format,
+                    self.pages_per_request, self.latency_budget_ms
+                )
+            total_pages = pdf_info['page_count']
+            
+            for page_num, page in results:
                 if page:
                     pages.append(page)
                     total_components += page.component_count
                     
-                    # Update statistics
-                    for component in page.components:
-                        # Update component type statistics
-                        if hasattr(component_stats, component.type):
-                            current_value = getattr(component_stats, component.type)
-                            setattr(component_stats, component.type, current_value + 1)
-                        
-                        # Update confidence statistics
-                        confidence_sum += component.confidence
-                        confidence_count += 1
+                    # Collect each page's confidences and types as flat arrays
+                    page_confidences.append(np.fromiter(
+                        (component.confidence for component in page.components),
+                        dtype=np.float64, count=page.component_count
+                    ))
+                    page_types.append(np.array([component.type for component in page.components], dtype=object))
                 else:
                     logger.warning(f"Failed to process page {page_num}")
             
+            confidences = np.concatenate(page_confidences) if page_confidences else np.empty(0)
+            types = np.concatenate(page_types) if page_types else np.empty(0, dtype=object)
+            
+            # Build the statistics once from the type counts
+            unique_types, type_counts = np.unique(types, return_counts=True)
+            component_stats = ComponentStatistics(**{
+                comp_type: int(count) for comp_type, count in zip(unique_types, type_counts)
+                if comp_type in _STAT_FIELDS
+            })
+            
             # Calculate average confidence
-            avg_confidence = confidence_sum / confidence_count if confidence_count > 0 else 0
+            avg_confidence = float(confidences.mean()) if confidences.size else 0
             
             # Create ProcessedDocument
             expected_components = estimate_expected_components(total_pages)
@@ -96,7 +186,8 @@ class PDFProcessor:
             processed_doc = ProcessedDocument(
                 job_id=job_id,
                 filename=pdf_path.name,
-                compilation_time=datetime.now(),
+                compilation_time=compilation_time,
+                processing_ms=(time.monotonic_ns() - start_ns) // 1_000_000,
                 total_pages=total_pages,
                 total_components=total_components,
                 expected_components=expected_components,
@@ -109,19 +200,77 @@ class PDFProcessor:
             # Save to JSON
             output_filename = pdf_path.stem + '.json'
             output_path = OUTPUT_DIR / output_filename
-            save_json_output(processed_doc.dict(), output_path)
+            save_json_output(processed_doc, output_path)
             
-            logger.info(f"Successfully processed {pdf_path.name} -> {output_path}")
+            logger.info(f"Successfully processed {pdf_path.name} in {processed_doc.processing_ms} ms -> {output_path}")
             
             return processed_doc
             
         except Exception as e:
             logger.error(f"Error processing PDF {pdf_path.name}: {str(e)}")
             return None
+    
+    async def _convert_and_ocr_async(self, pdf_path: Path,
+                                     job_id: Optional[str]) -> Tuple[dict, List[Tuple[int, Optional[Page]]]]:
+        """
+        Render a PDF and OCR its pages at the same time.
+        
+        Rendering runs in a thread and hands each page to the event loop through
+        a queue, so the first pages are on their way to Bedrock while the rest
+        are still being rendered.
+        
+        Args:
+            pdf_path: Path to the PDF file
+            job_id: Job identifier to keep the page images under, or None
+            
+        Returns:
+            Tuple of (PDF metadata dictionary, list of (page_number, Page or None))
+        """
+        loop = asyncio.get_running_loop()
+        
+        # Bounded so a renderer that outpaces Bedrock waits instead of holding
+        # every rendered page in memory
+        queue: asyncio.Queue = asyncio.Queue(maxsize=2 * self.ocr_client.max_inflight)
+        stop_rendering = threading.Event()
+        
+        def put(item):
+            asyncio.run_coroutine_threadsafe(queue.put(item), loop).result()
+        
+        def render():
+            try:
+                pdf_info, page_images = self.pdf_converter.iter_pages(
+                    pdf_path, job_id, chunks_per_worker=_STREAM_CHUNKS_PER_WORKER
+                )
+                for page_image in page_images:
+                    if stop_rendering.is_set():
+                        break
+                    put(page_image)
+                return pdf_info
+            finally:
+                # Always end the stream, so OCR finishes even if rendering fails
+                put(None)
+        
+        async def rendered_pages():
+            while (page_image := await queue.get()) is not None:
+                yield page_image
+        
+        renderer = asyncio.ensure_future(asyncio.to_thread(render))
+        logger.info(f"Running OCR on pages of {pdf_path.name} as they are rendered")
+        try:
+            results = await self.ocr_client.process_image_stream(
+                rendered_pages(), self.pdf_converter.image_format,
+                self.pages_per_request, self.latency_budget_ms
+            )
+        except BaseException:
+            # Free the queue so the render thread is not left blocked on a full one
+            stop_rendering.set()
+            while not queue.empty():
+                queue.get_nowait()
+            raise
         
-        finally:
-            # Clean up temporary images
-            clean_temp_images(job_id)
+        # Re-raises any rendering error
+        pdf_info = await renderer
+        return pdf_info, results
     
     def process_directory(self, directory: Path = PROCUREMENT_DOCS_DIR, 
                          pattern: str = "*.pdf") -> List[ProcessedDocument]:
@@ -130,26 +279,15 @@ class PDFProcessor:
         
         Args:
             directory: Directory containing PDFs
-            pattern: File pattern to match
+            pattern: File pattern to match (case-insensitive)
             
         Returns:
             List of ProcessedDocument objects
         """
-        pdf_files = list(directory.glob(pattern))
+        pdf_files = find_pdf_files(directory, pattern)
         logger.info(f"Found {len(pdf_files)} PDF files to process")
         
-        processed_docs = []
-        
-        for i, pdf_path in enumerate(pdf_files, 1):
-            logger.info(f"Processing file {i}/{len(pdf_files)}: {pdf_path.name}")
-            
-            doc = self.process_single_pdf(pdf_path)
-            if doc:
-                processed_docs.append(doc)
-            
-            # Log progress
-            if i % 10 == 0:
-                logger.info(f"Progress: {i}/{len(pdf_files)} files processed")
+        processed_docs = self._process_files(pdf_files)
         
         logger.info(f"Completed processing. Successfully processed {len(processed_docs)}/{len(pdf_files)} files")
         
@@ -167,16 +305,67 @@ class PDFProcessor:
         """
         logger.info(f"Processing batch of {len(pdf_paths)} PDFs")
         
-        processed_docs = []
+        return self._process_files(pdf_paths)
+    
+    def _process_files(self, pdf_files: List[Path]) -> List[ProcessedDocument]:
+        """
+        Process PDF files, in parallel worker processes when more than one is used.
         
-        for i, pdf_path in enumerate(pdf_paths, 1):
-            logger.info(f"Processing {i}/{len(pdf_paths)}: {pdf_path.name}")
+        Args:
+            pdf_files: List of PDF file paths
             
-            doc = self.process_single_pdf(pdf_path)
-            if doc:
-                processed_docs.append(doc)
+        Returns:
+            List of ProcessedDocument objects, in the order of pdf_files
+        """
+        total = len(pdf_files)
+        workers = min(self.pdf_workers, total)
         
-        return processed_docs
+        if workers <= 1:
+            processed_docs = []
+            for i, pdf_path in enumerate(pdf_files, 1):
+                logger.info(f"Processing file {i}/{total}: {pdf_path.name}")
+                
+                doc = self.process_single_pdf(pdf_path)
+                if doc:
+                    processed_docs.append(doc)
+                
+                # Log progress
+                if i % 10 == 0:
+                    logger.info(f"Progress: {i}/{total} files processed")
+            return processed_docs
+        
+        # Split the render processes, the Bedrock concurrency and the TPS quota
+        # between the PDF workers, so that together they stay within the CPU
+        # budget and the configured Bedrock limits
+        settings = dict(self._worker_settings,
+                        render_workers=max(1, self.pdf_converter.workers // workers),
+                        ocr_workers=max(1, self._worker_settings["ocr_workers"] // workers),
+                        max_tps=self._worker_settings["max_tps"] / workers)
+        
+        logger.info(f"Processing {total} files in {workers} worker processes "
+                    f"with {settings['render_workers']} render process(es) and "
+                    f"{settings['ocr_workers']} concurrent OCR request(s) each")
+        results: List[Optional[ProcessedDocument]] = [None] * total
+        
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(settings,)) as executor:
+            futures = {
+                executor.submit(_process_one, pdf_path): index
+                for index, pdf_path in enumerate(pdf_files)
+            }
+            
+            for i, future in enumerate(as_completed(futures), 1):
+                index = futures[future]
+                try:
+                    results[index] = future.result()
+                except Exception as e:
+                    logger.error(f"Error processing PDF {pdf_files[index].name}: {str(e)}")
+                
+                # Log progress
+                if i % 10 == 0:
+                    logger.info(f"Progress: {i}/{total} files processed")
+        
+        return [doc for doc in results if doc]
     
     def get_processing_summary(self, processed_docs: List[ProcessedDocument]) -> dict:
         """
@@ -192,38 +381,94 @@ class PDFProcessor:
             return {"error": "No documents processed"}
         
         total_docs = len(processed_docs)
-        total_pages = sum(doc.total_pages for doc in processed_docs)
-        total_components = sum(doc.total_components for doc in processed_docs)
-        avg_confidence = sum(doc.average_confidence for doc in processed_docs) / total_docs
-        avg_completeness = sum(doc.completeness for doc in processed_docs) / total_docs
-        
-        # Aggregate component statistics
-        total_stats = ComponentStatistics()
-        for doc in processed_docs:
-            for comp_type in ['text', 'table', 'image', 'header', 'footer']:
-                current = getattr(total_stats, comp_type)
-                doc_value = getattr(doc.component_statistics, comp_type)
-                setattr(total_stats, comp_type, current + doc_value)
+        
+        # Gather the per-document numbers into one array and aggregate each column
+        summary = np.fromiter(
+            (
+                (doc.total_pages, doc.total_components, doc.average_confidence, doc.completeness,
+                 tuple(getattr(doc.component_statistics, comp_type) for comp_type in _COMPONENT_STAT_TYPES))
+                for doc in processed_docs
+            ),
+            dtype=_SUMMARY_DTYPE,
+            count=total_docs
+        )
+        
+        # Aggregate component statistics with one reduction over the (documents, types) block
+        total_stats = ComponentStatistics(**dict(
+            zip(_COMPONENT_STAT_TYPES, summary['types'].sum(axis=0).tolist())
+        ))
         
         return {
             "total_documents": total_docs,
-            "total_pages": total_pages,
-            "total_components": total_components,
-            "average_confidence": round(avg_confidence, 4),
-            "average_completeness": round(avg_completeness, 4),
-            "component_breakdown": total_stats.dict(),
+            "total_pages": int(summary['pages'].sum()),
+            "total_components": int(summary['components'].sum()),
+            "average_confidence": round(float(summary['confidence'].mean()), 4),
+            "average_completeness": round(float(summary['completeness'].mean()), 4),
+            "component_breakdown": total_stats.model_dump(),
             "processing_time": datetime.now().isoformat()
         }
 
 
-def create_processor(aws_region: str = AWS_REGION) -> PDFProcessor:
+def _init_worker(settings: Dict[str, Any]):
+    """
+    Create the processor used by a PDF worker process.
+    
+    Args:
+        settings: PDFProcessor keyword arguments
+    """
+    global _worker_processor
+    
+    # A forked worker inherits the parent's cached boto3 client, whose connection
+    # pool and locks are not fork-safe, so it builds its own
+    _get_bedrock_client.cache_clear()
+    _worker_processor = PDFProcessor(**settings, pdf_workers=1)
+
+
+def _process_one(pdf_path: Path) -> Optional[ProcessedDocument]:
+    """
+    Process a single PDF in a worker process.
+    
+    Args:
+        pdf_path: Path to the PDF file
+        
+    Returns:
+        ProcessedDocument object or None if processing fails
+    """
+    return _worker_processor.process_single_pdf(pdf_path)
+
+def create_processor(aws_region: str = AWS_REGION, image_format: str = IMAGE_FORMAT,
+                     keep_images: bool = False, use_async: bool = False,
+                     ocr_workers: int = MAX_INFLIGHT,
+                     pdf_workers: int = PDF_WORKERS,
+                     render_workers: int = RENDER_WORKERS,
+                     pages_per_request: int = PAGES_PER_REQUEST,
+                     use_cache: bool = OCR_CACHE) -> PDFProcessor:
     """
     Factory function to create a PDF processor.
     
     Args:
         aws_region: AWS region for Bedrock service
+        image_format: Page image format sent to Bedrock (PNG, JPEG, WEBP)
+        keep_images: Write page images to disk and keep them for debugging
+        use_async: Send the page requests from an asyncio event loop while the PDF
+            is still being rendered (requires aioboto3)
+        ocr_workers: Maximum number of pages sent to Bedrock concurrently
+        pdf_workers: Number of processes used to handle PDFs in parallel
+        render_workers: Number of processes used to render the pages of a PDF
+        pages_per_request: Number of consecutive pages sent in one Bedrock request
+        use_cache: Reuse cached OCR responses for identical page images
         
     Returns:
         Configured PDFProcessor instance
     """
-    return PDFProcessor(aws_region)
+    return PDFProcessor(
+        aws_region=aws_region,
+        image_format=image_format,
+        keep_images=keep_images,
+        use_async=use_async,
+        ocr_workers=ocr_workers,
+        pdf_workers=pdf_workers,
+        render_workers=render_workers,
+        pages_per_request=pages_per_request,
+        use_cache=use_cache
+    )
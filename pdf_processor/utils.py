@@ -1,20 +1,47 @@
 """
 Utility functions for the PDF processing pipeline.
 """
+import fnmatch
 import logging
-import hashlib
+import os
+import re
+import secrets
 import shutil
+import time
 from pathlib import Path
-from typing import Optional
+from typing import Any, List, Optional, Sequence, Union
 import json
 from datetime import datetime
 
-from .config import LOG_DIR, LOG_FORMAT, TEMP_IMAGES_DIR
+import numpy as np
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+from .config import LOG_DIR, LOG_FORMAT, TEMP_IMAGES_DIR, OCR_CACHE_DIR
+
+
+# Characters that can change the JSON scanner state
+_JSON_TOKEN_RE = re.compile(r'[{}"\\]')
+
+# Log file for this run and the handlers shared by every logger, so the file
+# is opened once per process however many modules call setup_logger
+_LOG_FILE = LOG_DIR / f'pdf_processor_{datetime.now():%Y%m%d}.log'
+_FILE_HANDLER = logging.FileHandler(_LOG_FILE)
+_CONSOLE_HANDLER = logging.StreamHandler()
+
+for _handler in (_FILE_HANDLER, _CONSOLE_HANDLER):
+    _handler.setLevel(logging.INFO)
+    _handler.setFormatter(logging.Formatter(LOG_FORMAT))
+del _handler
 
 
 def setup_logger(name: str) -> logging.Logger:
     """
-    Set up a logger with both file and console handlers.
+    Set up a logger with the shared file and console handlers.
     
     Args:
         name: Logger name
@@ -26,31 +53,21 @@ def setup_logger(name: str) -> logging.Logger:
     
     if not logger.handlers:
         logger.setLevel(logging.INFO)
-        
-        # File handler
-        file_handler = logging.FileHandler(
-            LOG_DIR / f'pdf_processor_{datetime.now().strftime("%Y%m%d")}.log'
-        )
-        file_handler.setLevel(logging.INFO)
-        
-        # Console handler
-        console_handler = logging.StreamHandler()
-        console_handler.setLevel(logging.INFO)
-        
-        # Formatter
-        formatter = logging.Formatter(LOG_FORMAT)
-        file_handler.setFormatter(formatter)
-        console_handler.setFormatter(formatter)
-        
-        logger.addHandler(file_handler)
-        logger.addHandler(console_handler)
+        logger.addHandler(_FILE_HANDLER)
+        logger.addHandler(_CONSOLE_HANDLER)
     
     return logger
 
 
+logger = setup_logger(__name__)
+
+
 def generate_job_id(filename: str) -> str:
     """
-    Generate a unique job ID based on filename and timestamp.
+    Generate a unique job ID.
+    
+    The ID is random rather than derived from the filename and time, so jobs
+    started at the same moment in parallel worker processes cannot collide.
     
     Args:
         filename: PDF filename
@@ -58,9 +75,7 @@ def generate_job_id(filename: str) -> str:
     Returns:
         8-character job ID
     """
-    timestamp = str(datetime.now().timestamp())
-    content = f"{filename}_{timestamp}"
-    return hashlib.md5(content.encode()).hexdigest()[:8]
+    return secrets.token_hex(4)
 
 
 def clean_temp_images(job_id: str):
@@ -71,20 +86,204 @@ def clean_temp_images(job_id: str):
         job_id: Job identifier
     """
     job_temp_dir = TEMP_IMAGES_DIR / job_id
-    if job_temp_dir.exists():
-        shutil.rmtree(job_temp_dir)
+    try:
+        entries = os.scandir(job_temp_dir)
+    except FileNotFoundError:
+        return
+    
+    # The job directory only holds page images, so scandir's entry types are
+    # enough and no per-file stat is needed
+    with entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                shutil.rmtree(entry.path, ignore_errors=True)
+            else:
+                try:
+                    os.unlink(entry.path)
+                except FileNotFoundError:
+                    pass
+    try:
+        os.rmdir(job_temp_dir)
+    except OSError as e:
+        logger.warning(f"Could not remove temp images for job {job_id}: {str(e)}")
+
+
+def clear_ocr_cache(max_age_days: Optional[float] = None, cache_dir: Path = OCR_CACHE_DIR) -> int:
+    """
+    Delete cached OCR responses.
+    
+    Args:
+        max_age_days: Only delete entries older than this many days (None = all)
+        cache_dir: OCR cache directory
+        
+    Returns:
+        Number of entries deleted
+    """
+    cutoff = time.time() - max_age_days * 86400 if max_age_days is not None else None
+    try:
+        entries = os.scandir(cache_dir)
+    except FileNotFoundError:
+        return 0
+    
+    removed = 0
+    with entries:
+        for entry in entries:
+            try:
+                if not entry.is_file() or (cutoff is not None and entry.stat().st_mtime >= cutoff):
+                    continue
+                os.unlink(entry.path)
+                removed += 1
+            except FileNotFoundError:
+                pass
+    return removed
+
+
+def loads_json(data: Union[bytes, str]) -> Any:
+    """
+    Parse JSON from bytes or str, using orjson when available.
+    
+    Args:
+        data: JSON document
+        
+    Returns:
+        Parsed object
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+class IncrementalJsonParser:
+    """
+    Locate the first complete top-level JSON object in text that may arrive in pieces.
+    
+    Each character is examined once. Braces inside strings are ignored, so prose
+    before or after the object (including stray braces) does not affect the result.
+    """
+    
+    def __init__(self):
+        self._chunks = []
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self.result = None
+    
+    def feed(self, text: str) -> Optional[str]:
+        """
+        Consume the next piece of text.
+        
+        Args:
+            text: Next chunk of the response
+            
+        Returns:
+            The JSON object text once it is complete, otherwise None
+        """
+        if self.result is not None:
+            return self.result
+        
+        start = 0 if self._depth else None
+        skip_index = 0 if self._escape else -1
+        self._escape = False
+        
+        for match in _JSON_TOKEN_RE.finditer(text):
+            i = match.start()
+            char = match.group()
+            
+            if not self._depth:
+                if char == '{':
+                    start = i
+                    self._depth = 1
+                continue
+            
+            if self._in_string:
+                if i == skip_index:
+                    continue
+                if char == '\\':
+                    skip_index = i + 1
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char == '{':
+                self._depth += 1
+            elif char == '}':
+                self._depth -= 1
+                if not self._depth:
+                    self._chunks.append(text[start:i + 1])
+                    self.result = ''.join(self._chunks)
+                    self._chunks = []
+                    return self.result
+        
+        if start is not None:
+            self._chunks.append(text[start:])
+            self._escape = skip_index == len(text)
+        return None
 
 
-def save_json_output(data: dict, output_path: Path):
+def extract_json_object(text: str) -> Optional[str]:
+    """
+    Extract the first complete JSON object from text.
+    
+    Args:
+        text: Text that contains a JSON object, possibly surrounded by prose
+        
+    Returns:
+        The JSON object text, or None if no complete object is found
+    """
+    return IncrementalJsonParser().feed(text)
+
+
+def _json_default(value: Any) -> Any:
+    """
+    Serialize values the stdlib json module does not handle natively.
+    
+    Args:
+        value: Object to serialize
+        
+    Returns:
+        JSON-serializable representation
+    """
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def save_json_output(data: Union[BaseModel, dict], output_path: Path):
     """
     Save processed data as formatted JSON.
     
+    Pydantic models are serialized directly by pydantic-core, without building
+    an intermediate dictionary. Dictionaries use orjson when available.
+    Datetime values are written as ISO 8601 strings.
+    
     Args:
-        data: Dictionary to save
+        data: Pydantic model or dictionary to save
         output_path: Path to save the JSON file
     """
-    with open(output_path, 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+    if isinstance(data, BaseModel):
+        output = data.model_dump_json(indent=2).encode('utf-8')
+    elif orjson is not None:
+        output = orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    else:
+        output = json.dumps(data, indent=2, ensure_ascii=False, default=_json_default).encode('utf-8')
+    write_file_bytes(output_path, output)
+
+
+def write_file_bytes(output_path: Path, data: bytes):
+    """
+    Write bytes to a file with unbuffered OS-level calls.
+    
+    Args:
+        output_path: Path of the file to create or overwrite
+        data: Bytes to write
+    """
+    fd = os.open(output_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
 
 
 def estimate_expected_components(page_count: int, avg_components_per_page: int = 8) -> int:
@@ -116,6 +315,20 @@ def calculate_bbox_area(bbox: list) -> int:
     return abs(bbox[2] - bbox[0]) * abs(bbox[3] - bbox[1])
 
 
+def calculate_bbox_areas(bboxes: Union[np.ndarray, Sequence[Sequence[int]]]) -> np.ndarray:
+    """
+    Calculate the areas of many bounding boxes at once.
+    
+    Args:
+        bboxes: Array of shape (N, 4) with rows [x1, y1, x2, y2]
+        
+    Returns:
+        Array of N areas
+    """
+    boxes = np.asarray(bboxes, dtype=np.int64).reshape(-1, 4)
+    return np.abs(boxes[:, 2] - boxes[:, 0]) * np.abs(boxes[:, 3] - boxes[:, 1])
+
+
 def validate_pdf_path(pdf_path: Path) -> bool:
     """
     Validate that the PDF path exists and is a PDF file.
@@ -129,6 +342,25 @@ def validate_pdf_path(pdf_path: Path) -> bool:
     return pdf_path.exists() and pdf_path.suffix.lower() == '.pdf'
 
 
+def find_pdf_files(directory: Path, pattern: str = "*.pdf") -> List[Path]:
+    """
+    List the files in a directory whose names match a pattern, ignoring case.
+    
+    os.scandir reports each entry's type from the directory listing, so no
+    extra stat call is needed per file, and "*.pdf" also matches ".PDF" files.
+    
+    Args:
+        directory: Directory to search
+        pattern: Shell-style file name pattern
+        
+    Returns:
+        List of matching file paths
+    """
+    matches = re.compile(fnmatch.translate(pattern), re.IGNORECASE).match
+    with os.scandir(directory) as entries:
+        return [Path(entry.path) for entry in entries if entry.is_file() and matches(entry.name)]
+
+
 def format_component_id(page_num: int, component_idx: int) -> str:
     """
     Format a component ID.
@@ -155,17 +387,18 @@ def parse_table_content(raw_table: str) -> str:
     """
     # This is a simplified version - you might want to enhance this
     # based on the actual table formats you encounter
-    lines = raw_table.strip().split('\n')
-    if not lines:
+    stripped = raw_table.strip()
+    if not stripped:
         return raw_table
     
-    # Simple markdown table formatting
-    formatted_lines = []
-    for i, line in enumerate(lines):
-        if i == 1:  # Add separator after header
-            cells = line.split('|')
-            separator = '|' + '|'.join(['---' for _ in cells if cells]) + '|'
-            formatted_lines.append(separator)
-        formatted_lines.append(line)
+    lines = stripped.split('\n')
+    if len(lines) < 2:
+        return stripped
+    
+    # Simple markdown table formatting: add a separator after the header,
+    # with one column per cell of the header row
+    n_cols = lines[0].count('|') + 1
+    separator = '|' + '|'.join(['---'] * n_cols) + '|'
+    lines.insert(1, separator)
     
-    return '\n'.join(formatted_lines)
+    return '\n'.join(lines)
@@ -12,6 +12,7 @@ BASE_DIR = Path(__file__).parent
 directories = [
     "processed_json",
     "temp_images",
+    "ocr_cache",
     "logs",
     "procurement_docs"  # In case it doesn't exist
 ]